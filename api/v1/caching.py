@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+"""Helpers to answer conditional GET requests without building the body,
+and to serve repeated GET requests from memory."""
+
+from collections import OrderedDict
+from flask import Response, make_response, request
+from functools import wraps
+import hashlib
+from models import storage
+from os import getenv
+import threading
+
+
+class ResponseCache:
+    """LRU cache of response bodies, bounded by their total size, each
+    valid for one ETag"""
+
+    def __init__(self, max_bytes):
+        """Instantiate a ResponseCache object"""
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+        self.__max_bytes = max_bytes
+        self.__bytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def get(self, key, tag):
+        """returns the response cached under key if it has the ETag tag"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or entry[0] != tag:
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+        return Response(entry[1], headers=entry[2])
+
+    def put(self, key, tag, body, headers):
+        """caches the body and headers of a response with the ETag tag
+        under key, evicting the least recently used responses"""
+        if len(body) > self.__max_bytes:
+            return
+        with self.__lock:
+            old = self.__entries.pop(key, None)
+            if old is not None:
+                self.__bytes -= len(old[1])
+            self.__entries[key] = (tag, body, headers)
+            self.__bytes += len(body)
+            while self.__bytes > self.__max_bytes:
+                old = self.__entries.popitem(last=False)[1]
+                self.__bytes -= len(old[1])
+                self.__evictions += 1
+
+    def remember(self, key, tag, response):
+        """makes the body of response get cached under key once it has
+        been sent, unless it grows larger than the cache"""
+        if self.__max_bytes <= 0:
+            return
+        headers = [(k, v) for k, v in response.headers
+                   if k not in ("Content-Length", "ETag")]
+        chunks = response.iter_encoded()
+
+        def generate():
+            """yields the chunks of the body while keeping them"""
+            body, size = [], 0
+            for chunk in chunks:
+                yield chunk
+                if body is not None:
+                    body.append(chunk)
+                    size += len(chunk)
+                    if size > self.__max_bytes:
+                        body = None
+            if body is not None:
+                self.put(key, tag, b"".join(body), headers)
+        response.response = generate()
+
+    def stats(self):
+        """returns the statistics of the cache"""
+        with self.__lock:
+            return {"entries": len(self.__entries), "bytes": self.__bytes,
+                    "max_bytes": self.__max_bytes, "hits": self.__hits,
+                    "misses": self.__misses, "evictions": self.__evictions}
+
+
+cache = ResponseCache(int(getenv("HBNB_API_CACHE_BYTES", str(16 << 20))))
+
+
+def etag(*clss):
+    """
+    Returns the ETag of the current request when it only depends on the
+    objects of the classes clss, or on every object if there are none
+    """
+    versions = [storage.version(cls) for cls in clss or (None,)]
+    key = "{} {}".format(request.full_path, versions)
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def conditional(*clss):
+    """
+    Decorates a view whose response only depends on the objects of the
+    classes clss, or on every object if there are none, so that it gets an
+    ETag, answers 304 to an If-None-Match naming it, and is served from
+    the cache until one of those objects changes; in DB mode the changes
+    made by other processes are only seen once the storage recounts the
+    rows, up to HBNB_DB_VERSION_INTERVAL seconds (1 by default) later
+    """
+    def decorator(view):
+        """wraps view"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """answers 304, a cached response or calls view"""
+            tag = etag(*clss)
+            if request.if_none_match.contains_weak(tag):
+                response = make_response("", 304)
+            else:
+                response = cache.get(request.full_path, tag)
+                if response is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    cache.remember(request.full_path, tag, response)
+            response.set_etag(tag)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,23 @@
+#!/usr/bin/python3
+"""Helpers to send only the attributes a client asks for."""
+
+from flask import abort, request
+
+
+def requested_fields(fields=None):
+    """
+    Returns the list of attribute names given as fields, a list or a comma
+    separated string, or else by the fields query parameter, or None when
+    no field was requested
+    """
+    if fields is None:
+        fields = request.args.get("fields")
+    if isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(",")]
+    if fields is None:
+        return None
+    if not isinstance(fields, list) or \
+            not all(isinstance(field, str) for field in fields):
+        abort(400, description="Invalid fields")
+    fields = [field for field in fields if field]
+    return fields or None
@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+"""Helpers to send collections one page at a time."""
+
+from api.v1.fields import requested_fields
+from api.v1.streaming import jsonify_iter
+from flask import abort, request
+from models import storage
+from urllib.parse import urlencode
+
+
+def paginate(cls, **filters):
+    """
+    Returns a response listing the objects of class cls whose attributes
+    have the values of filters, or only the page of at most limit of them
+    that follows the id after, ordered by id, when the query string has a
+    limit or an after cursor; only the requested fields are sent
+    """
+    fields = requested_fields()
+    limit = request.args.get("limit")
+    after = request.args.get("after")
+    if limit is None and after is None and not filters:
+        return jsonify_iter(storage.iter_all(cls, fields=fields), fields)
+    if limit is not None:
+        if not limit.isascii() or not limit.isdecimal() or int(limit) < 1:
+            abort(400, description="Invalid limit")
+        limit = int(limit)
+    objs = storage.page(cls, after, limit and limit + 1, fields, **filters)
+    response = jsonify_iter(objs[:limit], fields)
+    if limit is not None and len(objs) > limit:
+        cursor = objs[limit - 1].id
+        args = dict(request.args.items(), limit=limit, after=cursor)
+        url = request.base_url + "?" + urlencode(args)
+        response.headers["Link"] = '<{}>; rel="next"'.format(url)
+        response.headers["X-Next-Cursor"] = cursor
+    return response
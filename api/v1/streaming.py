@@ -0,0 +1,41 @@
+#!/usr/bin/python3
+"""Helpers to send large JSON responses piece by piece.
+
+The teardown of the view closes its storage session before the first
+piece is sent, so in DB mode the objects are read through a new session of
+the same thread; stream_with_context tears the application context down
+again once the last piece is sent, which closes that session too.
+"""
+
+from flask import Response, current_app, stream_with_context
+
+
+def jsonify_iter(objs, fields=None):
+    """
+    Returns a response holding the JSON array of the to_dict(fields) of
+    objs, serialized one object at a time while the response is sent
+    """
+    def generate():
+        """yields the JSON array of objs in pieces"""
+        dumps = current_app.json.dumps
+        separator = "["
+        for obj in objs:
+            yield separator + dumps(obj.to_dict(fields), separators=(",", ":"))
+            separator = ","
+        yield "[]\n" if separator == "[" else "]\n"
+    return Response(stream_with_context(generate()),
+                    mimetype=current_app.json.mimetype)
+
+
+def ndjsonify_iter(objs, fields=None):
+    """
+    Returns a response holding the to_dict(fields) of each of objs as one
+    line of newline delimited JSON, serialized while the response is sent
+    """
+    def generate():
+        """yields one JSON line per object of objs"""
+        dumps = current_app.json.dumps
+        for obj in objs:
+            yield dumps(obj.to_dict(fields), separators=(",", ":")) + "\n"
+    return Response(stream_with_context(generate()),
+                    mimetype="application/x-ndjson")
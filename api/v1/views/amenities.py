@@ -6,25 +6,28 @@ API actions
 from flask import jsonify, abort, request
 from models import storage
 from models.amenity import Amenity
+from api.v1.pagination import paginate
+from api.v1.caching import conditional
+from api.v1.fields import requested_fields
 from api.v1.views import app_views
 
 
 @app_views.route('/amenities', methods=['GET'], strict_slashes=False)
+@conditional(Amenity)
 def get_amenities():
     """Retrieves the list of all Amenity objects"""
-    amenities = storage.all(Amenity)
-    dic = [val.to_dict() for key, val in amenities.items()]
-    return jsonify(dic)
+    return paginate(Amenity)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['GET'],
                  strict_slashes=False)
+@conditional(Amenity)
 def get_amenity(amenity_id):
     """Retrieves the Amenity with the id of amenity_id"""
     amenity = storage.get(Amenity, amenity_id)
     if not amenity:
         abort(404)
-    return jsonify(amenity.to_dict())
+    return jsonify(amenity.to_dict(requested_fields()))
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['DELETE'],
@@ -73,5 +76,5 @@ def update_amenity(amenity_id):
         if key not in ignore_keys:
             setattr(amenity, key, value)
 
-    storage.save()
+    amenity.save()
     return jsonify(amenity.to_dict()), 200
@@ -7,26 +7,31 @@ from flask import jsonify, abort, request
 from models import storage
 from models.city import City
 from models.state import State
+from api.v1.pagination import paginate
+from api.v1.caching import conditional
+from api.v1.fields import requested_fields
 from api.v1.views import app_views
 
 
 @app_views.route('/states/<state_id>/cities', methods=['GET'],
                  strict_slashes=False)
+@conditional(State, City)
 def get_cities(state_id):
     """Retrieves the list of all City objects of a State"""
     state = storage.get(State, state_id)
     if not state:
         abort(404)
-    return jsonify([city.to_dict() for city in state.cities])
+    return paginate(City, state_id=state.id)
 
 
 @app_views.route('/cities/<city_id>', methods=['GET'], strict_slashes=False)
+@conditional(City)
 def get_city(city_id):
     """Retrieves a City object"""
     city = storage.get(City, city_id)
     if not city:
         abort(404)
-    return jsonify(city.to_dict())
+    return jsonify(city.to_dict(requested_fields()))
 
 
 @app_views.route('/cities/<city_id>', methods=['DELETE'], strict_slashes=False)
@@ -78,5 +83,5 @@ def update_city(city_id):
         if key not in ignore_keys:
             setattr(city, key, value)
 
-    storage.save()
+    city.save()
     return jsonify(city.to_dict()), 200
@@ -1,8 +1,9 @@
 #!/usr/bin/python3
 """Index route for the API."""
 
+from api.v1.caching import cache, conditional
 from api.v1.views import app_views
-from flask import jsonify
+from flask import abort, jsonify
 from models import storage
 from models.amenity import Amenity
 from models.base_model import BaseModel
@@ -29,7 +30,23 @@ def index():
 
 
 @app_views.route('/stats', methods=['GET'], strict_slashes=False)
+@conditional()
 def count():
     """Retrieves the number of each objects by type"""
-    dict = {k: storage.count(v) for k, v in classes.items()}
+    counts = storage.counts()
+    dict = {k: counts[v.__name__] for k, v in classes.items()}
     return jsonify(dict)
+
+
+@app_views.route('/pool', methods=['GET'], strict_slashes=False)
+def pool():
+    """Retrieves the statistics of the database connection pool"""
+    if not hasattr(storage, "pool_stats"):
+        abort(404)
+    return jsonify(storage.pool_stats())
+
+
+@app_views.route('/cache', methods=['GET'], strict_slashes=False)
+def cache_stats():
+    """Retrieves the statistics of the response cache"""
+    return jsonify(cache.stats())
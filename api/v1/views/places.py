@@ -1,6 +1,10 @@
 #!/usr/bin/python3
 """Creates a new view for Place objects
 """
+from api.v1.pagination import paginate
+from api.v1.streaming import jsonify_iter, ndjsonify_iter
+from api.v1.caching import conditional
+from api.v1.fields import requested_fields
 from api.v1.views import app_views
 from flask import abort, jsonify, request
 from models import storage
@@ -13,23 +17,23 @@ from models.amenity import Amenity
 
 @app_views.route('/cities/<city_id>/places', methods=['GET'],
                  strict_slashes=False)
+@conditional(City, Place)
 def get_city_places(city_id):
     """Retrieves list of all places in a city"""
     city = storage.get(City, city_id)
-    places = storage.all(Place)
-    if city_id != city.id:
+    if not city:
         abort(404)
     else:
-        list = [v.to_dict() for v in places.values() if city_id == v.city_id]
-        return jsonify(list)
+        return paginate(Place, city_id=city.id)
 
 
 @app_views.route('/places/<place_id>', methods=['GET'], strict_slashes=False)
+@conditional(Place)
 def get_places(place_id):
     """Retrieves a place object by its id"""
     place = storage.get(Place, place_id)
     if place:
-        return jsonify(place.to_dict())
+        return jsonify(place.to_dict(requested_fields()))
     else:
         abort(404)
 
@@ -40,16 +44,15 @@ def update_place(place_id):
     if not request.get_json():
         abort(400, description="Not a JSON")
 
-    output = storage.all()
     place = storage.get(Place, place_id)
     data = request.get_json()
     ignore_keys = {'id', 'user_id', 'city_id', 'create_at', 'updated_at'}
     if place:
         for k, v in data.items():
             if k not in ignore_keys:
-                setattr(output["Place" + "." + place_id], k, v)
-        output["Place" + "." + place_id].save()
-        return jsonify(output["Place" + "." + place_id].to_dict()), 200
+                setattr(place, k, v)
+        place.save()
+        return jsonify(place.to_dict()), 200
     else:
         abort(404)
 
@@ -58,10 +61,9 @@ def update_place(place_id):
                  strict_slashes=False)
 def del_place(place_id):
     """Delete a place with place_id"""
-    output = storage.all()
     place = storage.get(Place, place_id)
     if place:
-        storage.delete(output["Place" + "." + place_id])
+        storage.delete(place)
         storage.save()
         return jsonify({}), 200
     else:
@@ -93,45 +95,36 @@ def add_place(city_id):
 
 @app_views.route('/places_search', methods=["POST"], strict_slashes=False)
 def places_search():
-    """Retrieves all Place objects depending on the JSON request body."""
-    if not request.get_json():
+    """Retrieves all Place objects depending on the JSON request body,
+    ordered by id, a page of limit places after the id after at a time"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
         abort(400, description="Not a JSON")
-
-    data = request.get_json()
-    places = set()  # Use a set to avoid duplicates
-
-    if not data or all(len(data.get(key, [])) == 0
-                       for key in ["states", "cities", "amenities"]):
-        return jsonify([place.to_dict()
-                       for place in storage.all(Place).values()])
-
-    # Retrieve states and cities from the request
-    states = data.get("states", [])
-    cities = data.get("cities", [])
-
-    city_ids = set()
-    for state_id in states:
-        state = storage.get(State, state_id)
-        if state:
-            city_ids.update(city.id for city in state.cities)
-
-    for city_id in cities:
-        city_ids.add(city_id)
-
-    for city_id in city_ids:
-        city = storage.get(City, city_id)
-        if city:
-            places.update(city.places)
-
-    # Filter places by amenities (if specified)
-    if "amenities" in data and data["amenities"]:
-        amenity_ids = set(data["amenities"])
-        filtered_places = []
-        for place in places:
-            place_amenities = {amenity.id for amenity in place.amenities}
-            # Place must have ALL amenities
-            if amenity_ids.issubset(place_amenities):
-                filtered_places.append(place)
-        places = filtered_places
-
-    return jsonify([place.to_dict() for place in places])
+    limit = data.get("limit")
+    if limit is not None and (type(limit) is not int or limit < 1):
+        abort(400, description="Invalid limit")
+    after = data.get("after")
+    if after is not None and not isinstance(after, str):
+        abort(400, description="Invalid after")
+    fields = requested_fields(data.get("fields"))
+    ids = {}
+    for key in ("states", "cities", "amenities"):
+        ids[key] = data.get(key) or []
+        if not isinstance(ids[key], list) or \
+                not all(isinstance(id, str) for id in ids[key]):
+            abort(400, description="Invalid " + key)
+
+    places = storage.search_places(ids["states"], ids["cities"],
+                                   ids["amenities"], after,
+                                   limit and limit + 1, fields)
+    next_after = None
+    if limit is not None and len(places) > limit:
+        places = places[:limit]
+        next_after = places[-1].id
+    if request.accept_mimetypes.best == "application/x-ndjson":
+        response = ndjsonify_iter(places, fields)
+    else:
+        response = jsonify_iter(places, fields)
+    if next_after is not None:
+        response.headers["X-Next-Cursor"] = next_after
+    return response
@@ -4,26 +4,29 @@ Create a new view for the link between Place objects and Amenity objects
 that handles all default RESTFul API actions
 """
 from flask import jsonify, abort
-from models import storage
+from models import storage, storage_t
 from models.place import Place
 from models.amenity import Amenity
+from api.v1.caching import conditional
+from api.v1.fields import requested_fields
 from api.v1.views import app_views
-from os import getenv
 
 
 @app_views.route('/places/<place_id>/amenities', methods=['GET'],
                  strict_slashes=False)
+@conditional(Place, Amenity)
 def get_place_amenities(place_id):
     """Retrieves the list of all Amenity objects of a Place"""
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
 
-    if getenv('HBNB_TYPE_STORAGE') == 'db':
-        amenities = [amenity.to_dict() for amenity in place.amenities]
+    fields = requested_fields()
+    if storage_t == 'db':
+        amenities = [amenity.to_dict(fields) for amenity in place.amenities]
     else:
-        amenities = [storage.get(Amenity, amenity_id).to_dict()
-                     for amenity_id in place.amenity_ids]
+        amenities = [amenity.to_dict(fields) for amenity in
+                     storage.get_many(Amenity, place.amenity_ids)]
 
     return jsonify(amenities)
 
@@ -40,16 +43,16 @@ def delete_place_amenity(place_id, amenity_id):
     if not amenity:
         abort(404)
 
-    if getenv('HBNB_TYPE_STORAGE') == 'db':
+    if storage_t == 'db':
         if amenity not in place.amenities:
             abort(404)
         place.amenities.remove(amenity)
     else:
         if amenity_id not in place.amenity_ids:
             abort(404)
-        place.amenity_ids.remove(amenity_id)
+        place.amenity_ids = [i for i in place.amenity_ids if i != amenity_id]
 
-    storage.save()
+    place.save()
     return jsonify({}), 200
 
 
@@ -65,14 +68,14 @@ def link_place_amenity(place_id, amenity_id):
     if not amenity:
         abort(404)
 
-    if getenv('HBNB_TYPE_STORAGE') == 'db':
+    if storage_t == 'db':
         if amenity in place.amenities:
             return jsonify(amenity.to_dict()), 200
         place.amenities.append(amenity)
     else:
         if amenity_id in place.amenity_ids:
             return jsonify(amenity.to_dict()), 200
-        place.amenity_ids.append(amenity_id)
+        place.amenity_ids = place.amenity_ids + [amenity_id]
 
-    storage.save()
+    place.save()
     return jsonify(amenity.to_dict()), 201
@@ -8,11 +8,15 @@ from models import storage
 from models.place import Place
 from models.review import Review
 from models.user import User  # Ensure User is imported for validation
+from api.v1.pagination import paginate
+from api.v1.caching import conditional
+from api.v1.fields import requested_fields
 from api.v1.views import app_views
 
 
 @app_views.route('/places/<place_id>/reviews', methods=['GET'],
                  strict_slashes=False)
+@conditional(Place, Review)
 def get_reviews(place_id):
     """Retrieves the list of all review objects of a Place"""
     place = storage.get(Place, place_id)
@@ -20,16 +24,17 @@ def get_reviews(place_id):
         abort(404)  # Return 404 if place does not exist
 
     # Return list of reviews as JSON
-    return jsonify([review.to_dict() for review in place.reviews])
+    return paginate(Review, place_id=place.id)
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'], strict_slashes=False)
+@conditional(Review)
 def get_review(review_id):
     """Retrieves a single Review object"""
     review = storage.get(Review, review_id)
     if not review:
         abort(404)
-    return jsonify(review.to_dict())
+    return jsonify(review.to_dict(requested_fields()))
 
 
 @app_views.route('/reviews/<review_id>', methods=['DELETE'],
@@ -99,5 +104,5 @@ def update_review(review_id):
         if key not in ignore_keys:
             setattr(review, key, value)
 
-    storage.save()
+    review.save()
     return jsonify(review.to_dict()), 200
@@ -3,6 +3,9 @@
 Creates a new view for State objects that handles all default RESTful
 API actions
 """
+from api.v1.pagination import paginate
+from api.v1.caching import conditional
+from api.v1.fields import requested_fields
 from api.v1.views import app_views
 from flask import jsonify, abort, request
 from models import storage
@@ -10,11 +13,10 @@ from models.state import State
 
 
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
+@conditional(State)
 def get_states():
     """Retrieves list of all State objects"""
-    states = storage.all(State)
-    dict = [v.to_dict() for k, v in states.items()]
-    return jsonify(dict)
+    return paginate(State)
 
 
 @app_views.route('/states', methods=['POST'], strict_slashes=False)
@@ -31,18 +33,14 @@ def create_state():
 
 
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
+@conditional(State)
 def get_state_id(state_id):
     """Retrieves State object of state_id"""
-    states = storage.all(State)
-    dict = []
-    for k, v in states.items():
-        if k == "State" + "." + state_id:
-            dict = v.to_dict()
-
-    if len(dict) == 0:
+    state = storage.get(State, state_id)
+    if not state:
         abort(404)
     else:
-        return jsonify(dict)
+        return jsonify(state.to_dict(requested_fields()))
 
 
 @app_views.route('/states/<state_id>', methods=['PUT'], strict_slashes=False)
@@ -52,17 +50,17 @@ def update_state_id(state_id):
         abort(400, description="Not a JSON")
 
     data = request.get_json()
-    output = storage.all()
+    state = storage.get(State, state_id)
     ignore_keys = {'id', 'created_at', 'updated_at'}
 
-    if not "State" + "." + state_id in output.keys():
+    if not state:
         abort(404)
     else:
         for key, value in data.items():
             if key not in ignore_keys:
-                setattr(output["State" + "." + state_id], key, value)
-        output["State" + "." + state_id].save()
-        return jsonify(output["State" + "." + state_id].to_dict()), 200
+                setattr(state, key, value)
+        state.save()
+        return jsonify(state.to_dict()), 200
 
 
 @app_views.route(
@@ -1,6 +1,9 @@
 #!/usr/bin/python3
 """View for the User object"""
 
+from api.v1.pagination import paginate
+from api.v1.caching import conditional
+from api.v1.fields import requested_fields
 from api.v1.views import app_views
 from flask import jsonify, abort, request
 from models import storage
@@ -8,11 +11,10 @@ from models.user import User
 
 
 @app_views.route('/users', methods=["GET"], strict_slashes=False)
+@conditional(User)
 def get_users():
     """Retrieves list of all users"""
-    users = storage.all(User)
-    dict = [v.to_dict() for k, v in users.items()]
-    return jsonify(dict)
+    return paginate(User)
 
 
 @app_views.route('/users', methods=["POST"], strict_slashes=False)
@@ -32,13 +34,14 @@ def add_user():
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
+@conditional(User)
 def get_user_id(user_id):
     """Retrieves a user by their id"""
-    users = storage.all(User)
-    if not "User" + "." + user_id in users.keys():
+    user = storage.get(User, user_id)
+    if not user:
         abort(404)
     else:
-        return jsonify(users["User" + "." + user_id].to_dict())
+        return jsonify(user.to_dict(requested_fields()))
 
 
 @app_views.route('/users/<user_id>', methods=['PUT'], strict_slashes=False)
@@ -48,14 +51,14 @@ def update_user(user_id):
         abort(400, description="Not a JSON")
 
     data = request.get_json()
-    output = storage.all()
+    user = storage.get(User, user_id)
     ignore_keys = {'id', 'email', 'created_at', 'updated_at'}
-    if "User" + "." + user_id in output.keys():
+    if user:
         for k, v in data.items():
             if k not in ignore_keys:
-                setattr(output["User" + "." + user_id], k, v)
-        output["User" + "." + user_id].save()
-        return jsonify(output["User" + "." + user_id]), 200
+                setattr(user, k, v)
+        user.save()
+        return jsonify(user.to_dict()), 200
     else:
         abort(404)
 
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+Measures the memory FileStorage holds after reloading a JSON file of 100k
+objects, and the peak reached while reloading it, with the default models
+and with HBNB_FILE_COMPACT=1
+usage: ./benchmarks/memory.py [number of objects]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+
+def measure(path):
+    """prints the memory allocated by reloading the JSON file at path and
+    the peak allocated while reloading it"""
+    import gc
+    import tracemalloc
+    import models
+    from models.engine.file_storage import FileStorage
+    tracemalloc.start()
+    FileStorage._FileStorage__file_path = path
+    FileStorage._FileStorage__objects = {}
+    models.storage.reload()
+    gc.collect()
+    print(*tracemalloc.get_traced_memory())
+
+
+def records(number):
+    """returns the records of number places of 100 cities and users"""
+    from models.city import City
+    from models.place import Place
+    from models.user import User
+    cities = [City(name="City", state_id="") for i in range(100)]
+    users = [User(email="a@b.c") for i in range(100)]
+    objs = cities + users + [
+        Place(name="Place {}".format(i), city_id=cities[i % 100].id,
+              user_id=users[i % 97].id, number_rooms=i % 7,
+              description="A place to stay")
+        for i in range(number)]
+    return {obj.__class__.__name__ + "." + obj.id: obj.to_dict()
+            for obj in objs}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        measure(sys.argv[2])
+        sys.exit()
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "file.json")
+        with open(path, "w") as f:
+            json.dump(records(number), f)
+        print("file.json           {:8.1f} MB".format(
+            os.path.getsize(path) / 1e6))
+        sizes = []
+        for compact in ("0", "1"):
+            env = dict(os.environ, HBNB_FILE_COMPACT=compact)
+            env.pop("HBNB_TYPE_STORAGE", None)
+            out = subprocess.check_output(
+                [sys.executable, __file__, str(number), path], env=env,
+                cwd=directory)
+            size, peak = map(int, out.split())
+            sizes.append(size)
+            print("HBNB_FILE_COMPACT={} {:8.1f} MB, {:8.1f} MB at peak".format(
+                compact, size / 1e6, peak / 1e6))
+        print("ratio               {:8.1f}".format(sizes[0] / sizes[1]))
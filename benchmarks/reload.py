@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""
+Times FileStorage.reload() on a JSON file of 100k objects, eager and lazy,
+and the building of the objects from their records against the __init__
+based path it replaced
+usage: ./benchmarks/reload.py [number of objects]
+"""
+
+import json
+from models.engine.file_storage import FileStorage, classes
+from models.place import Place
+from models.state import State
+from models.user import User
+import os
+import sys
+import tempfile
+import timeit
+
+
+def records(number):
+    """returns the records of number objects, as written by save()"""
+    kinds = (State, Place, User)
+    objs = [kinds[i % 3](name="Object {}".format(i), email="a@b.c",
+                         password="pwd", number_rooms=i % 7)
+            for i in range(number)]
+    return {obj.__class__.__name__ + "." + obj.id: obj.to_dict()
+            for obj in objs}
+
+
+if __name__ == "__main__":
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = records(number)
+    values = list(data.values())
+    build = FileStorage()._FileStorage__build
+    for name, hydrate in (("__init__(**value)",
+                           lambda value: classes[value["__class__"]](**value)),
+                          ("__build(value)", build)):
+        best = min(timeit.repeat(lambda: [hydrate(value) for value in values],
+                                 number=1, repeat=3))
+        print("{:<20}{:8.1f} ms for {} objects".format(name, best * 1000,
+                                                       number))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "file.json")
+        with open(path, "w") as f:
+            json.dump(data, f)
+        FileStorage._FileStorage__file_path = path
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        for lazy in (False, True):
+            FileStorage._FileStorage__lazy = lazy
+            FileStorage._FileStorage__objects = {}
+            best = min(timeit.repeat(storage.reload, number=1, repeat=3))
+            print("{:<20}{:8.1f} ms for {} objects".format(
+                "lazy reload()" if lazy else "reload()", best * 1000, number))
+        key = next(iter(data))
+        start = timeit.default_timer()
+        storage.get(data[key]["__class__"], key.partition(".")[2])
+        print("{:<20}{:8.3f} ms".format("first get()",
+                                        (timeit.default_timer() - start) *
+                                        1000))
@@ -0,0 +1,38 @@
+#!/usr/bin/python3
+"""
+Times FileStorage.all() and the FileStorage.new() that follows it, which
+has to leave the dictionary returned by all() unchanged, on a storage of
+100k objects
+usage: ./benchmarks/snapshot.py [number of objects]
+"""
+
+from models.engine.file_storage import FileStorage
+from models.state import State
+import sys
+import timeit
+
+
+if __name__ == "__main__":
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage()
+    for i in range(number):
+        storage.new(State(name=str(i)))
+
+    def alternate():
+        """creates 1000 states, each right after a call to all(), and
+        returns the mean times of all() and new()"""
+        states = [State(name="new") for i in range(1000)]
+        reads = writes = 0
+        for state in states:
+            start = timeit.default_timer()
+            storage.all()
+            middle = timeit.default_timer()
+            storage.new(state)
+            reads += middle - start
+            writes += timeit.default_timer() - middle
+        return reads / len(states), writes / len(states)
+    reads, writes = min(alternate() for i in range(3))
+    for name, best in (("all()", reads), ("new() after all()", writes)):
+        print("{:<20}{:10.6f} ms with {} objects".format(
+            name, best * 1000, number))
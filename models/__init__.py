@@ -7,8 +7,16 @@ from os import getenv
 
 
 storage_t = getenv("HBNB_TYPE_STORAGE")
+# file mode keeps the attributes of the objects in slots
+compact_models = storage_t not in ("db", "sqlite") and \
+    getenv("HBNB_FILE_COMPACT") == "1"
 
-if storage_t == "db":
+if storage_t == "sqlite":
+    # the SQLite engine maps the same SQLAlchemy models as the MySQL one
+    storage_t = "db"
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage()
+elif storage_t == "db":
     from models.engine.db_storage import DBStorage
     storage = DBStorage()
 else:
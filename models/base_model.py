@@ -13,20 +13,78 @@ import uuid
 import hashlib
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
+# attributes of the instances that to_dict() leaves out
+hidden = ("_sa_instance_state", "password") if models.storage_t == "db" \
+    else ("_sa_instance_state",)
+
+
+# datetime -> the same datetime formatted with time, for the values
+# formatted recently
+formatted = {}
+
+
+def format_time(value):
+    """returns the datetime value formatted with time, remembering up to
+    65536 of the values formatted since the last time it forgot them all"""
+    text = formatted.get(value)
+    if text is None:
+        if len(formatted) >= 1 << 16:
+            formatted.clear()
+        text = formatted[value] = value.isoformat(timespec="microseconds")
+    return text
+
+
+def serializer(cls):
+    """returns a function computing to_dict(fields) from the __dict__ of an
+    instance of cls, with all that only depends on cls worked out once;
+    it copies __dict__ rather than the fields cls declares because the
+    instances also hold the attributes given to __init__ or set by the API,
+    and to_dict() keeps them in the order they were set"""
+    name = cls.__name__
+
+    def serialize(attrs, fields=None):
+        """returns the dictionary of to_dict(fields) for the attributes
+        attrs"""
+        if fields is None:
+            new_dict = attrs.copy()
+        else:
+            new_dict = {key: attrs[key] for key in fields if key in attrs}
+        for key in hidden:
+            if key in new_dict:
+                del new_dict[key]
+        if "created_at" in new_dict:
+            new_dict["created_at"] = format_time(new_dict["created_at"])
+        if "updated_at" in new_dict:
+            new_dict["updated_at"] = format_time(new_dict["updated_at"])
+        if fields is None or "__class__" in fields:
+            new_dict["__class__"] = name
+        return new_dict
+    return serialize
+
 
 if models.storage_t == "db":
     Base = declarative_base()
 else:
     Base = object
 
+if models.compact_models:
+    from models.compact import CompactModel as Model
+else:
+    Model = object
+
 
-class BaseModel:
+class BaseModel(Model):
     """The BaseModel class from which future classes will be derived"""
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
         updated_at = Column(DateTime, default=datetime.utcnow)
 
+    def __init_subclass__(cls, **kwargs):
+        """compiles the serializer of each model class"""
+        super().__init_subclass__(**kwargs)
+        cls._serialize = staticmethod(serializer(cls))
+
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
         if kwargs:
@@ -35,11 +93,11 @@ class BaseModel:
                     setattr(self, key, hashlib.md5(value.encode()).hexdigest())
                 if key != "__class__" and key != "password":
                     setattr(self, key, value)
-            if kwargs.get("created_at", None) and type(self.created_at) is str:
+            if kwargs.get("created_at") and type(kwargs["created_at"]) is str:
                 self.created_at = datetime.strptime(kwargs["created_at"], time)
             else:
                 self.created_at = datetime.utcnow()
-            if kwargs.get("updated_at", None) and type(self.updated_at) is str:
+            if kwargs.get("updated_at") and type(kwargs["updated_at"]) is str:
                 self.updated_at = datetime.strptime(kwargs["updated_at"], time)
             else:
                 self.updated_at = datetime.utcnow()
@@ -50,6 +108,13 @@ class BaseModel:
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute and lets the storage update its indexes"""
+            old_value = getattr(self, name, None)
+            super().__setattr__(name, value)
+            models.storage.changed(self, name, old_value)
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
@@ -61,24 +126,22 @@ class BaseModel:
         models.storage.new(self)
         models.storage.save()
 
-    def to_dict(self):
-        """returns a dictionary containing all keys/values of the instance"""
-        new_dict = self.__dict__.copy()
-
-        storage_t = getenv("HBNB_TYPE_STORAGE")
-        if storage_t == "db":
-            if "password" in new_dict.keys():
-                del new_dict["password"]
+    def to_dict(self, fields=None):
+        """returns a dictionary containing all keys/values of the instance,
+        or only the ones named in fields"""
+        return self._serialize(self.__dict__, fields)
 
-        if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
-        if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
-        new_dict["__class__"] = self.__class__.__name__
-        if "_sa_instance_state" in new_dict:
-            del new_dict["_sa_instance_state"]
-        return new_dict
+    def _load(self, attrs):
+        """sets the attributes attrs without notifying the storage"""
+        if models.compact_models:
+            for key, value in attrs.items():
+                super().__setattr__(key, value)
+        else:
+            self.__dict__.update(attrs)
 
     def delete(self):
         """delete the current instance from the storage"""
         models.storage.delete(self)
+
+
+BaseModel._serialize = staticmethod(serializer(BaseModel))
@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+"""
+Contains the compact representation of the models in file mode
+"""
+
+from datetime import datetime, timedelta, timezone
+import sys
+
+# the datetimes are stored as the number of microseconds since epoch
+epoch = datetime(1970, 1, 1)
+microsecond = timedelta(microseconds=1)
+# format of the datetimes given as strings, the one of to_dict()
+time = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def microseconds(value):
+    """returns the number of microseconds from epoch to the datetime value;
+    an aware value is taken in UTC, as the naive datetimes of the models
+    are, and a string is parsed as to_dict() formats datetimes"""
+    if isinstance(value, str):
+        value = datetime.strptime(value, time)
+    elif value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - epoch) // microsecond
+
+
+def intern_ids(name, value):
+    """returns value with the strings it holds interned if name is the
+    name of an id or foreign key attribute, so that every reference to an
+    object shares the string of its id"""
+    if name == "id" or name.endswith("_id"):
+        if type(value) is str:
+            return sys.intern(value)
+    elif name.endswith("_ids") and type(value) is list:
+        return [sys.intern(item) if type(item) is str else item
+                for item in value]
+    return value
+
+
+class Attributes(dict):
+    """the dictionary returned as the __dict__ of a compact model: it is
+    only a copy of the attributes, so changing it raises TypeError rather
+    than being silently lost"""
+
+    def _copy_only(self, *args, **kwargs):
+        """raises TypeError"""
+        raise TypeError("the __dict__ of a compact model is a copy, set "
+                        "its attributes instead")
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = \
+        update = __ior__ = _copy_only
+
+
+class Compact(type):
+    """metaclass of the compact models: the class attributes holding the
+    default values of a class become its slots"""
+
+    def __new__(mcs, name, bases, namespace):
+        """creates the class, turning its default values into slots"""
+        fields = tuple(key for key, value in namespace.items()
+                       if not key.startswith("_") and not callable(value) and
+                       not isinstance(value, (property, classmethod)))
+        defaults, inherited = {}, ()
+        for base in reversed(bases):
+            defaults.update(getattr(base, "_defaults", {}))
+            inherited += tuple(field for field in getattr(base, "_fields", ())
+                               if field not in inherited)
+        for field in fields:
+            defaults[field] = namespace.pop(field)
+        namespace["__slots__"] = tuple(namespace.get("__slots__", ())) + \
+            fields
+        namespace["_defaults"] = defaults
+        namespace["_fields"] = inherited + \
+            tuple(namespace.get("_fields", ())) + fields
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class CompactModel(metaclass=Compact):
+    """
+    Base of the models when HBNB_FILE_COMPACT is 1: the attributes are kept
+    in slots instead of a dictionary, the ones without a slot in _extras,
+    the datetimes as integers and the ids interned
+    """
+    __slots__ = ("id", "_created", "_updated", "_extras")
+    _fields = ("id", "created_at", "updated_at")
+
+    @property
+    def created_at(self):
+        """the creation datetime"""
+        return epoch + self._created * microsecond
+
+    @created_at.setter
+    def created_at(self, value):
+        """stores the creation datetime as an integer"""
+        object.__setattr__(self, "_created", microseconds(value))
+
+    @property
+    def updated_at(self):
+        """the datetime of the last update"""
+        return epoch + self._updated * microsecond
+
+    @updated_at.setter
+    def updated_at(self, value):
+        """stores the datetime of the last update as an integer"""
+        object.__setattr__(self, "_updated", microseconds(value))
+
+    @property
+    def __dict__(self):
+        """a new dictionary of the attributes set on the instance, as the
+        __dict__ of the other models holds them; it cannot be changed"""
+        attrs = {}
+        get = object.__getattribute__
+        for field in self._fields:
+            try:
+                attrs[field] = get(self, field)
+            except AttributeError:
+                pass
+        extras = getattr(self, "_extras", None)
+        if extras:
+            attrs.update(extras)
+        return Attributes(attrs)
+
+    def __getattr__(self, name):
+        """returns the attributes without a slot, then the default values
+        of the slots that were not set"""
+        if name != "_extras":
+            extras = getattr(self, "_extras", None)
+            if extras and name in extras:
+                return extras[name]
+            if name in self._defaults:
+                return self._defaults[name]
+        raise AttributeError("{!r} object has no attribute {!r}".format(
+            type(self).__name__, name))
+
+    def __setattr__(self, name, value):
+        """sets the field or property name, or else the entry name of
+        _extras: the other slots are only set by the class itself"""
+        value = intern_ids(name, value)
+        if name in self._fields or \
+                isinstance(getattr(type(self), name, None), property):
+            object.__setattr__(self, name, value)
+        else:
+            extras = getattr(self, "_extras", None)
+            if extras is None:
+                extras = {}
+                object.__setattr__(self, "_extras", extras)
+            extras[name] = value
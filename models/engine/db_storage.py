@@ -13,12 +13,77 @@ from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import create_engine, distinct, event, func, or_, select
+from sqlalchemy.orm import load_only, scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
+import threading
+import time
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+# seconds after which counts() recounts the rows instead of trusting the
+# counters kept up to date by the commits
+recount_interval = float(getenv('HBNB_DB_RECOUNT_INTERVAL', '60'))
+# seconds after which version() recounts the rows: the changes made by other
+# processes change the versions, and so the ETags and cached responses of
+# the API, at most this long after they are committed
+version_interval = float(getenv('HBNB_DB_VERSION_INTERVAL', '1'))
+
+
+def pool_options():
+    """returns the connection pool arguments of create_engine() set by the
+    HBNB_DB_POOL_* environment variables"""
+    return {"poolclass": TimedQueuePool,
+            "pool_size": int(getenv('HBNB_DB_POOL_SIZE', '5')),
+            "max_overflow": int(getenv('HBNB_DB_MAX_OVERFLOW', '10')),
+            "pool_timeout": float(getenv('HBNB_DB_POOL_TIMEOUT', '30')),
+            "pool_recycle": int(getenv('HBNB_DB_POOL_RECYCLE', '3600')),
+            "pool_pre_ping": getenv('HBNB_DB_POOL_PRE_PING', '1') == '1'}
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that measures how long checkouts wait for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate a TimedQueuePool object"""
+        super().__init__(*args, **kwargs)
+        self.__lock = threading.Lock()
+        self.__checkouts = 0
+        self.__timeouts = 0
+        self.__wait = 0.0
+        self.__max_wait = 0.0
+
+    def _do_get(self):
+        """checks a connection out, timing the wait"""
+        start = time.monotonic()
+        try:
+            return super()._do_get()
+        except sqlalchemy.exc.TimeoutError:
+            with self.__lock:
+                self.__timeouts += 1
+            raise
+        finally:
+            wait = time.monotonic() - start
+            with self.__lock:
+                self.__checkouts += 1
+                self.__wait += wait
+                self.__max_wait = max(self.__max_wait, wait)
+
+    def stats(self):
+        """returns the current usage of the pool and its wait times"""
+        with self.__lock:
+            checkouts = self.__checkouts
+            return {"size": self.size(),
+                    "checked_in": self.checkedin(),
+                    "checked_out": self.checkedout(),
+                    "overflow": self.overflow(),
+                    "checkouts": checkouts,
+                    "timeouts": self.__timeouts,
+                    "wait_total": self.__wait,
+                    "wait_avg": self.__wait / checkouts if checkouts else 0.0,
+                    "wait_max": self.__max_wait}
+
 
 class DBStorage:
     """interaacts with the MySQL database"""
@@ -27,18 +92,45 @@ class DBStorage:
 
     def __init__(self):
         """Instantiate a DBStorage object"""
+        HBNB_ENV = getenv('HBNB_ENV')
+        self.__engine = self.create_engine()
+        self.__counting = threading.Lock()
+        self.__counters = None
+        self.__counted_at = 0.0
+        # int - number of recounts made, to tell whether one ran while a
+        # session was committing
+        self.__recounts = 0
+        # (number of rows, latest updated_at) of each class at the last
+        # recount
+        self.__census = None
+        # incremented on every change of the objects; it starts from the
+        # time so that the versions keep growing when the process restarts
+        self.__changes = time.time_ns()
+        # value of __changes when an object of each class last changed
+        self.__versions = {}
+        self.__started = self.__changes
+        if HBNB_ENV == "test":
+            Base.metadata.drop_all(self.__engine)
+
+    def create_engine(self):
+        """creates the engine connected to the MySQL database"""
         HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
         HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
-        HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
-        if HBNB_ENV == "test":
-            Base.metadata.drop_all(self.__engine)
+        return create_engine('mysql+mysqldb://{}:{}@{}/{}'.
+                             format(HBNB_MYSQL_USER,
+                                    HBNB_MYSQL_PWD,
+                                    HBNB_MYSQL_HOST,
+                                    HBNB_MYSQL_DB),
+                             **pool_options())
+
+    def pool_stats(self):
+        """returns statistics of the connection pool"""
+        pool = self.__engine.pool
+        if isinstance(pool, TimedQueuePool):
+            return pool.stats()
+        return {"status": pool.status()}
 
     def all(self, cls=None):
         """query on the current database session"""
@@ -51,24 +143,140 @@ class DBStorage:
                     new_dict[key] = obj
         return (new_dict)
 
+    def iter_all(self, cls=None, chunk_size=1000, fields=None):
+        """yields the objects of class cls, or of every class, fetching
+        them chunk_size rows at a time from a server-side cursor, and only
+        the columns named in fields if not None"""
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls is clss:
+                query = select(classes[clss])\
+                    .options(*self.__only(classes[clss], fields))\
+                    .execution_options(yield_per=chunk_size)
+                for obj in self.__session.scalars(query):
+                    yield obj
+
     def count(self, cls=None):
         """Counts number of objects in storage."""
-        new_dict = {}
+        counts = self.counts()
         if cls is None:
-            for clss in classes:
-                objs = self.__session.query(classes[clss]).all()
-                for obj in objs:
-                    key = obj.__class__.__name__ + '.' + obj.id
-                    new_dict[key] = obj
-            return len(new_dict)
-        else:
+            return sum(counts.values())
+        for clss in classes:
+            if cls is clss or cls is classes[clss]:
+                return counts[clss]
+        return 0
+
+    def counts(self):
+        """returns the number of objects of each class, from counters kept
+        up to date by the commits and recounted every recount_interval
+        seconds to catch the changes made by other processes"""
+        with self.__counting:
+            self.__refresh()
+            return dict(self.__counters)
+
+    def __refresh(self, interval=None):
+        """recounts the rows if the counters are older than interval
+        seconds, recount_interval by default, changing the version of the
+        classes whose number of rows or latest updated_at changed since the
+        last recount"""
+        if interval is None:
+            interval = recount_interval
+        now = time.monotonic()
+        if self.__counters is not None and now - self.__counted_at < interval:
+            return
+        census = self.__take_census()
+        if self.__census is not None:
+            for name in classes:
+                if census[name] != self.__census[name]:
+                    self.__touch(name)
+        self.__census = census
+        self.__counters = {name: census[name][0] for name in classes}
+        self.__counted_at = now
+        self.__recounts += 1
+
+    def recount(self):
+        """returns the number of committed rows of each class, in one
+        query"""
+        return {name: count
+                for name, (count, updated) in self.__take_census().items()}
+
+    def __take_census(self):
+        """returns the number of committed rows of each class and their
+        latest updated_at, in one query"""
+        columns = []
+        for clss in classes:
+            columns.append(select(func.count(classes[clss].id))
+                           .scalar_subquery())
+            columns.append(select(func.max(classes[clss].updated_at))
+                           .scalar_subquery())
+        with self.__engine.connect() as connection:
+            row = connection.execute(select(*columns)).one()
+        return {clss: (row[2 * i], row[2 * i + 1])
+                for i, clss in enumerate(classes)}
+
+    def __touch(self, name):
+        """records that an object of class name changed"""
+        self.__changes += 1
+        self.__versions[name] = self.__changes
+
+    def __flushed(self, session, flush_context):
+        """adds the objects inserted or deleted by a flush to the changes
+        of the counters pending in session, and the classes of the objects
+        it wrote to the classes changed by session"""
+        changes = session.info.setdefault("counts", {})
+        changed = session.info.setdefault("changed", set())
+        for objs, change in ((session.new, 1), (session.deleted, -1),
+                             (session.dirty, 0)):
+            for obj in objs:
+                name = obj.__class__.__name__
+                if name in classes:
+                    changes[name] = changes.get(name, 0) + change
+                    changed.add(name)
+
+    def __committing(self, session):
+        """records the number of recounts made before session commits"""
+        session.info["recounts"] = self.__recounts
+
+    def __committed(self, session):
+        """applies the changes of the counters pending in session and
+        changes the version of the classes it changed; the counters are
+        recounted instead if a recount ran during the commit, as it may
+        already have counted them"""
+        changes = session.info.pop("counts", None)
+        changed = session.info.pop("changed", None)
+        recounts = session.info.pop("recounts", None)
+        if not changed:
+            return
+        with self.__counting:
+            if recounts != self.__recounts:
+                self.__counters = None
+            elif self.__counters is not None:
+                for name, change in changes.items():
+                    self.__counters[name] += change
+            for name in changed:
+                self.__touch(name)
+
+    def __rolled_back(self, session):
+        """drops the changes of the counters pending in session"""
+        session.info.pop("counts", None)
+        session.info.pop("changed", None)
+        session.info.pop("recounts", None)
+
+    def version(self, cls=None):
+        """
+        returns a value that changes whenever an object of class cls, or
+        any object, is added, changed or deleted: a counter incremented by
+        the commits of this process, and by the recounts every
+        version_interval seconds for the changes made by other processes,
+        which it may thus miss for that long
+        """
+        with self.__counting:
+            self.__refresh(version_interval)
+            if cls is None:
+                return self.__changes
             for clss in classes:
                 if cls is clss or cls is classes[clss]:
-                    objs = self.__session.query(cls).all()
-                    for obj in objs:
-                        key = obj.__class__.__name__ + '.' + obj.id
-                        new_dict[key] = obj
-            return len(new_dict)
+                    return self.__versions.get(clss, self.__started)
+        return None
 
     def get(self, cls, id):
         """
@@ -77,11 +285,86 @@ class DBStorage:
         """
         for clss in classes:
             if cls is classes[clss]:
-                obj = self.__session.query(cls)\
-                    .filter(classes[clss].id.like(id)).first()
-                return obj
+                return self.__session.get(cls, id)
         return None
 
+    def get_many(self, cls, ids):
+        """
+        retrieves the objects of class cls whose ID is in ids with a single
+        query, in the order of ids, skipping the ones not found
+        """
+        ids = list(ids)
+        if cls not in classes.values() or not ids:
+            return []
+        objs = self.__session.query(cls).filter(cls.id.in_(set(ids))).all()
+        found = {obj.id: obj for obj in objs}
+        return [found[id] for id in dict.fromkeys(ids) if id in found]
+
+    def page(self, cls, after=None, limit=None, fields=None, **filters):
+        """
+        returns, ordered by id, at most limit objects of class cls with an
+        id after after and whose attributes have the values of filters,
+        seeking through the primary key index, and loading only the columns
+        named in fields if not None
+        """
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return []
+        query = select(cls).options(*self.__only(cls, fields))\
+            .filter_by(**filters)
+        if after is not None:
+            query = query.where(cls.id > after)
+        return self.__session.scalars(query.order_by(cls.id)
+                                      .limit(limit)).all()
+
+    def search_places(self, states=(), cities=(), amenities=(),
+                      after=None, limit=None, fields=None, chunk_size=1000):
+        """
+        returns, ordered by id, the places located in the given states or
+        cities (all the places if there are none) that have all the given
+        amenities, keeping at most limit of those with an id after after,
+        with a single query loading only the columns named in fields if not
+        None; without a limit, they are yielded as iter_all() yields them,
+        from a query run when they are first iterated
+        """
+        from models.place import place_amenity
+        query = select(Place).options(*self.__only(Place, fields))
+        if states or cities:
+            query = query.join(City, Place.city_id == City.id)\
+                .where(or_(City.state_id.in_(set(states)),
+                           Place.city_id.in_(set(cities))))
+        if amenities:
+            amenity_ids = set(amenities)
+            with_all = select(place_amenity.c.place_id)\
+                .where(place_amenity.c.amenity_id.in_(amenity_ids))\
+                .group_by(place_amenity.c.place_id)\
+                .having(func.count(distinct(place_amenity.c.amenity_id)) ==
+                        len(amenity_ids))
+            query = query.where(Place.id.in_(with_all))
+        if after is not None:
+            query = query.where(Place.id > after)
+        query = query.order_by(Place.id)
+        if limit is None:
+            return self.__yield_all(
+                query.execution_options(yield_per=chunk_size))
+        return self.__session.scalars(query.limit(limit)).all()
+
+    def __yield_all(self, query):
+        """yields the objects selected by query, in the session current
+        when they are first iterated"""
+        for obj in self.__session.scalars(query):
+            yield obj
+
+    def __only(self, cls, fields):
+        """returns the loader options loading only the columns of cls named
+        in fields, or no option if fields is None"""
+        if fields is None:
+            return []
+        columns = sqlalchemy.inspect(cls).column_attrs
+        return [load_only(cls.id, *[getattr(cls, field) for field in fields
+                                    if field in columns])]
+
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
@@ -99,6 +382,12 @@ class DBStorage:
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
         sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        event.listen(sess_factory, "after_flush", self.__flushed)
+        event.listen(sess_factory, "before_commit", self.__committing)
+        event.listen(sess_factory, "after_commit", self.__committed)
+        event.listen(sess_factory, "after_rollback", self.__rolled_back)
+        with self.__counting:
+            self.__counters = None
         Session = scoped_session(sess_factory)
         self.__session = Session
 
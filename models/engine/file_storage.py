@@ -3,7 +3,18 @@
 Contains the FileStorage class
 """
 
+import bisect
+from datetime import datetime
+import heapq
 import json
+from operator import attrgetter
+import os
+from os import getenv
+import re
+import threading
+import time
+import uuid
+import models
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -15,6 +26,90 @@ from models.user import User
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+# foreign key attributes that get a reverse index, by class name
+foreign_keys = {"City": ("state_id",),
+                "Place": ("city_id", "user_id"),
+                "Review": ("place_id", "user_id")}
+
+# save() appends the changed objects to a journal instead of rewriting
+# the whole JSON file
+journal = getenv("HBNB_FILE_JOURNAL") == "1"
+# number of journal records after which it is folded into the JSON file
+journal_max = int(getenv("HBNB_FILE_JOURNAL_MAX", "1000"))
+# save() waits for a background thread that writes the changes of all the
+# saves made within a short window at once, durably
+group_commit = getenv("HBNB_FILE_GROUP_COMMIT") == "1"
+# seconds a batch stays open after the last save that joined it
+commit_window = float(getenv("HBNB_FILE_COMMIT_WINDOW", "0.002"))
+# maximum seconds between the first save of a batch and its write
+commit_latency = float(getenv("HBNB_FILE_COMMIT_LATENCY", "0.02"))
+# reload() keeps the records of the JSON file and only builds their objects
+# when they are first accessed
+lazy = getenv("HBNB_FILE_LAZY") == "1"
+# number of characters reload() reads from the JSON file at once
+chunk_size = int(getenv("HBNB_FILE_CHUNK_SIZE", "65536"))
+
+# the "{" or "," before a key, and the key up to the start of its value
+first_key = re.compile(r'[ \t\n\r]*\{[ \t\n\r]*"((?:[^"\\]|\\.)*)"'
+                       r'[ \t\n\r]*:[ \t\n\r]*')
+next_key = re.compile(r'[ \t\n\r]*,[ \t\n\r]*"((?:[^"\\]|\\.)*)"'
+                      r'[ \t\n\r]*:[ \t\n\r]*')
+# the end of the object, after its last value or when it is empty
+first_end = re.compile(r'[ \t\n\r]*\{[ \t\n\r]*\}')
+next_end = re.compile(r'[ \t\n\r]*\}')
+# what follows a complete value: a value cut at the end of the buffer, like
+# the 1. of 1.5, is scanned as a shorter one that this does not follow
+value_end = re.compile(r'[ \t\n\r]*[,}]')
+
+
+def iter_records(f, size=chunk_size):
+    """yields the (key, value) pairs of the JSON object in the file f,
+    reading it size characters at a time so that only the current record
+    and chunk are held in memory; raises ValueError if it is not valid"""
+    scan = json.JSONDecoder().scan_once
+    # the attribute names are shared by the records, as with json.load
+    names = {}
+    buffer, pos, eof = "", 0, False
+    opener, key, end = '{"', first_key, first_end
+    while True:
+        # the separators written by json.dump are read without the regexes
+        name, start = None, -1
+        if buffer.startswith(opener, pos):
+            colon = buffer.find('": ', pos, pos + 256)
+            name = buffer[pos + len(opener):colon]
+            if colon < 0 or '"' in name or "\\" in name:
+                name = None
+            else:
+                start = colon + 3
+        if name is None:
+            match = key.match(buffer, pos)
+            if match:
+                name, start = match.group(1), match.end()
+                if "\\" in name:
+                    name = json.loads('"' + name + '"')
+        if 0 <= start < len(buffer):
+            try:
+                value, stop = scan(buffer, start)
+            except (StopIteration, ValueError):
+                stop = None
+            if stop is not None and (eof or value_end.match(buffer, stop)):
+                if type(value) is dict:
+                    value = {names.setdefault(attr, attr): item
+                             for attr, item in value.items()}
+                yield name, value
+                pos, opener, key, end = stop, ', "', next_key, next_end
+                continue
+        if end.match(buffer, pos):
+            return
+        if eof:
+            raise ValueError("invalid JSON object at {!r}".format(
+                buffer[pos:pos + 20]))
+        # drops what was parsed and reads the next chunk, bigger when a
+        # record does not fit in the buffer
+        chunk = f.read(max(size, len(buffer) - pos))
+        eof = not chunk
+        buffer, pos = buffer[pos:] + chunk, 0
+
 
 class FileStorage:
     """serializes instances to a JSON file & deserializes back to instances"""
@@ -23,71 +118,795 @@ class FileStorage:
     __file_path = "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects partitioned by <class name>
+    __by_class = {}
+    # dictionary - (<class name>, <foreign key>) -> value -> {key: obj}
+    __references = {}
+    # dictionary - amenity id -> set of the keys of the places that have it
+    __amenities = {}
+    # dictionary - <class name> -> sorted list of the ids of its objects,
+    # built by page() and then kept sorted
+    __ordered = {}
+    # dictionary - <class name> -> <class name>.id -> record loaded by
+    # reload() whose object is not built yet
+    __pending = {}
+    # bool - whether reload() leaves the records in __pending
+    __lazy = lazy
+    # the __objects dictionary that the indexes above were built from
+    __indexed = None
+    # dictionary - <class name>.id -> obj (None once deleted) since save
+    __dirty = {}
+    # dictionary - <class name>.id -> to_dict() of the unchanged objects,
+    # filled by the first save rather than by reload() so that reloading
+    # does not hold the records as well as their objects
+    __serialized = {}
+    # bool - whether __serialized is filled; compact models save memory by
+    # being serialized again at each save instead
+    __caching = not models.compact_models
+    # True when the next save must rewrite the whole JSON file
+    __rewrite = False
+    # bool - whether save() appends to the journal
+    __journaling = journal
+    # int - number of records appended to the journal
+    __journaled = 0
+    # int - incremented each time the whole JSON file is rewritten
+    __generation = 0
+    # (inode, mtime, size) of the JSON file and of the journal being
+    # compacted when they were last read or written
+    __stamps = (None, None)
+    # (inode, offset) up to which the journal was read or written
+    __journal_at = (None, 0)
+    # True while a compaction of the journal is running
+    __compacting = False
+    # lock serializing the writes to the JSON file and to its journal
+    __lock = threading.Lock()
+    # bool - whether save() waits for the group commit thread
+    __group_commit = group_commit
+    # condition the saves and the group commit thread synchronize on
+    __commit = threading.Condition()
+    # int - number of saves requested, and number of them written
+    __requested = 0
+    __committed = 0
+    # (first save, last save, exception) of the last batch that failed
+    __failure = None
+    # the group commit thread, once started
+    __flusher = None
+    # lock held by the methods that change __objects or its indexes
+    __writer = threading.RLock()
+    # the __objects dictionary last returned by all(): it is never changed
+    # again, writers only change the partitions of __by_class instead
+    __shared = None
+    # True when writes went to __by_class only because __objects was
+    # shared; the next all() then rebuilds __objects from __by_class
+    __stale = False
+    # lock making all() and the writes to __objects atomic
+    __publish = threading.Lock()
+    # int - incremented on every change of the objects; it starts from the
+    # time so that the versions keep growing when the process restarts
+    __changes = time.time_ns()
+    # dictionary - <class name> -> value of __changes when an object of
+    # the class last changed
+    __versions = {}
+    # int - value of __changes when the indexes were last rebuilt
+    __rebuilt = __changes
+
+    def __partitions(self):
+        """returns __by_class, rebuilding the indexes if __objects was
+        replaced; the unsaved changes, pending records and cached
+        serializations of the replaced objects are dropped with them"""
+        if FileStorage.__indexed is FileStorage.__objects:
+            return FileStorage.__by_class
+        with FileStorage.__writer:
+            if FileStorage.__indexed is not FileStorage.__objects:
+                FileStorage.__rewrite = FileStorage.__indexed is not None
+                FileStorage.__by_class = {}
+                FileStorage.__references = {}
+                FileStorage.__amenities = {}
+                FileStorage.__ordered = {}
+                FileStorage.__pending = {}
+                FileStorage.__changes += 1
+                FileStorage.__versions = {}
+                FileStorage.__rebuilt = FileStorage.__changes
+                FileStorage.__dirty = {}
+                FileStorage.__serialized = {}
+                FileStorage.__stale = False
+                for key, obj in list(FileStorage.__objects.items()):
+                    name = obj.__class__.__name__
+                    FileStorage.__by_class.setdefault(name, {})[key] = obj
+                    self.__reference(name, key, obj)
+                FileStorage.__indexed = FileStorage.__objects
+        return FileStorage.__by_class
+
+    def __store(self, key, obj):
+        """sets key to obj in __objects, or deletes key if obj is None,
+        unless all() handed __objects out: the change is then only in the
+        partitions until the next all()"""
+        with FileStorage.__publish:
+            objects = FileStorage.__objects
+            if objects is FileStorage.__shared:
+                FileStorage.__stale = True
+            elif obj is None:
+                objects.pop(key, None)
+            else:
+                objects[key] = obj
+
+    def __lookup(self, key):
+        """returns the object stored under key, or None"""
+        return self.__partitions().get(key.partition(".")[0], {}).get(key)
+
+    def __put(self, key, obj, touch=True):
+        """stores obj under key and indexes it; touch is False when obj is
+        only built from its pending record"""
+        name = obj.__class__.__name__
+        with FileStorage.__writer:
+            partition = self.__partitions().setdefault(name, {})
+            old = partition.get(key)
+            if old is obj:
+                return
+            self.__serialized.pop(key, None)
+            if old is not None:
+                self.__unreference(name, key, old)
+            elif name in self.__ordered:
+                bisect.insort(self.__ordered[name], obj.id)
+            partition[key] = obj
+            self.__reference(name, key, obj)
+            self.__store(key, obj)
+            self.__unpend(name, key)
+            if touch:
+                self.__touch(name)
+
+    def __remove(self, key):
+        """removes the object stored under key and its index entries"""
+        with FileStorage.__writer:
+            obj = self.__lookup(key)
+            if obj is None:
+                name = key.partition(".")[0]
+                if self.__unpend(name, key):
+                    self.__touch(name)
+            else:
+                name = obj.__class__.__name__
+                partition = self.__partitions().get(name, {})
+                self.__unreference(name, key, obj)
+                ids = self.__ordered.get(name, [])
+                index = bisect.bisect_left(ids, obj.id)
+                if ids[index:index + 1] == [obj.id]:
+                    del ids[index]
+                partition.pop(key, None)
+                self.__store(key, None)
+                self.__touch(name)
+
+    def __unpend(self, name, key):
+        """drops the pending record of key, returning whether there was
+        one"""
+        records = self.__pending.get(name)
+        if not records or records.pop(key, None) is None:
+            return False
+        if not records:
+            self.__pending.pop(name, None)
+        return True
+
+    def __hydrate(self, name=None):
+        """builds the objects of the pending records of class name, or of
+        every class"""
+        if not self.__pending or \
+                (name is not None and name not in self.__pending):
+            return
+        with FileStorage.__writer:
+            self.__partitions()
+            names = list(self.__pending) if name is None else [name]
+            for name in names:
+                for key, value in list(self.__pending.get(name, {}).items()):
+                    self.__build_pending(key, value)
+
+    def __build_pending(self, key, value):
+        """builds and stores the object of the pending record value"""
+        self.__put(key, self.__build(value), False)
+
+    def __touch(self, name):
+        """records that an object of class name changed"""
+        FileStorage.__changes += 1
+        self.__versions[name] = FileStorage.__changes
+
+    def __reference(self, name, key, obj):
+        """adds obj to the reverse index of each of its foreign keys"""
+        for attr in foreign_keys.get(name, ()):
+            index = self.__references.setdefault((name, attr), {})
+            value = self.__reference_key(getattr(obj, attr, None))
+            index.setdefault(value, {})[key] = obj
+        if name == "Place":
+            self.__link_amenities(key, obj.amenity_ids)
+
+    def __unreference(self, name, key, obj):
+        """removes obj from the reverse index of each of its foreign keys"""
+        for attr in foreign_keys.get(name, ()):
+            self.__drop_reference(name, attr, getattr(obj, attr, None), key)
+        if name == "Place":
+            self.__unlink_amenities(key, obj.amenity_ids)
+
+    def __amenity_ids(self, amenity_ids):
+        """returns the amenity ids of the list amenity_ids, which is treated
+        as empty if it is not a list"""
+        if not isinstance(amenity_ids, list):
+            return ()
+        return [amenity_id for amenity_id in amenity_ids
+                if isinstance(amenity_id, str)]
+
+    def __link_amenities(self, key, amenity_ids):
+        """adds the place key to the posting set of each amenity id"""
+        for amenity_id in self.__amenity_ids(amenity_ids):
+            self.__amenities.setdefault(amenity_id, set()).add(key)
+
+    def __unlink_amenities(self, key, amenity_ids):
+        """removes the place key from the posting set of each amenity id"""
+        for amenity_id in self.__amenity_ids(amenity_ids):
+            places = self.__amenities.get(amenity_id, set())
+            places.discard(key)
+            if not places:
+                self.__amenities.pop(amenity_id, None)
+
+    def __reference_key(self, value):
+        """returns the key of value in a reverse index: None for the lists
+        and dictionaries, which cannot be keys"""
+        return None if isinstance(value, (list, dict)) else value
+
+    def __drop_reference(self, name, attr, value, key):
+        """removes key from the reverse index entry (name, attr) = value"""
+        index = self.__references.get((name, attr), {})
+        value = self.__reference_key(value)
+        refs = index.get(value, {})
+        refs.pop(key, None)
+        if not refs:
+            index.pop(value, None)
 
     def all(self, cls=None):
-        """returns the dictionary __objects"""
+        """returns the dictionary __objects, or a copy of the objects of
+        class cls; neither is changed by later writes, so they can be read
+        while other threads write"""
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
-        return self.__objects
+            if not isinstance(cls, str):
+                cls = cls.__name__
+            self.__hydrate(cls)
+            return dict(self.__partitions().get(cls, {}))
+        self.__hydrate()
+        if FileStorage.__stale:
+            with FileStorage.__writer:
+                partitions = self.__partitions()
+                with FileStorage.__publish:
+                    if FileStorage.__stale:
+                        objects = {}
+                        for partition in partitions.values():
+                            objects.update(partition)
+                        FileStorage.__objects = objects
+                        FileStorage.__indexed = objects
+                        FileStorage.__stale = False
+        with FileStorage.__publish:
+            FileStorage.__shared = FileStorage.__objects
+            return FileStorage.__shared
+
+    def iter_all(self, cls=None, chunk_size=1000, fields=None):
+        """yields the objects of class cls, or every object, from a snapshot
+        of the storage; chunk_size and fields are accepted for compatibility
+        with DBStorage"""
+        if cls is None:
+            objs = self.all().values()
+        else:
+            if not isinstance(cls, str):
+                cls = cls.__name__
+            self.__hydrate(cls)
+            objs = list(self.__partitions().get(cls, {}).values())
+        for obj in objs:
+            yield obj
 
     def count(self, cls=None):
         """Counts number of objects in storage"""
         if cls is not None:
-            f = {
-                k: v
-                for k, v in self.__objects.items()
-                if cls == v.__class__ or cls == v.__class__.__name__
-            }
-            return len(f)
+            if not isinstance(cls, str):
+                cls = cls.__name__
+            return len(self.__partitions().get(cls, {})) + \
+                len(self.__pending.get(cls, ()))
         else:
-            return len(self.__objects)
+            return sum(len(partition) for partition in
+                       list(self.__partitions().values())) + \
+                sum(len(records) for records in self.__pending.values())
+
+    def counts(self):
+        """returns the number of objects of each class"""
+        partitions = self.__partitions()
+        pending = self.__pending
+        return {clss: len(partitions.get(clss, {})) +
+                len(pending.get(clss, ())) for clss in classes}
+
+    def version(self, cls=None):
+        """
+        returns a value that changes whenever an object of class cls, or
+        any object, is added, changed or deleted
+        """
+        self.__partitions()
+        if cls is None:
+            return FileStorage.__changes
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return self.__versions.get(cls, FileStorage.__rebuilt)
 
     def get(self, cls, id):
         """
         retrieves and returns one object based on class and its ID or None
         if not found
         """
-        for clss in classes:
-            if cls is classes[clss] and clss + "." + id in\
-              self.__objects.keys():
-                return self.__objects[clss + "." + id]
-        return print(None)
+        if cls is None or id is None:
+            return None
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        if cls not in classes:
+            return None
+        key = cls + "." + id
+        obj = self.__partitions().get(cls, {}).get(key)
+        if obj is None and self.__pending:
+            with FileStorage.__writer:
+                self.__partitions()
+                value = self.__pending.get(cls, {}).get(key)
+                if value is not None:
+                    self.__build_pending(key, value)
+                obj = self.__lookup(key)
+        return obj
+
+    def get_many(self, cls, ids):
+        """
+        retrieves the objects of class cls whose ID is in ids, in the order
+        of ids, skipping the ones not found
+        """
+        objs = (self.get(cls, id) for id in dict.fromkeys(ids))
+        return [obj for obj in objs if obj is not None]
+
+    def related(self, cls, attr, value):
+        """returns the list of cls objects whose attribute attr is value"""
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__hydrate(cls)
+        partition = self.__partitions().get(cls, {})
+        if attr in foreign_keys.get(cls, ()):
+            index = self.__references.get((cls, attr), {})
+            return list(index.get(value, {}).values())
+        return [obj for obj in list(partition.values())
+                if getattr(obj, attr, None) == value]
+
+    def page(self, cls, after=None, limit=None, fields=None, **filters):
+        """
+        returns, ordered by id, at most limit objects of class cls with an
+        id after after and whose attributes have the values of filters;
+        fields is accepted for compatibility with DBStorage
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        if filters:
+            attr, value = filters.popitem()
+            objs = (obj for obj in self.related(cls, attr, value)
+                    if all(getattr(obj, key, None) == val
+                           for key, val in filters.items()))
+            return self.__first(objs, after, limit)
+        self.__hydrate(cls)
+        partition = self.__partitions().get(cls, {})
+        ids = self.__ordered.get(cls)
+        if ids is None:
+            with FileStorage.__writer:
+                ids = self.__ordered.get(cls)
+                if ids is None:
+                    ids = sorted(obj.id for obj in partition.values())
+                    self.__ordered[cls] = ids
+        start = 0 if after is None else bisect.bisect_right(ids, after)
+        stop = None if limit is None else start + limit
+        objs = (partition.get(cls + "." + id) for id in ids[start:stop])
+        return [obj for obj in objs if obj is not None]
+
+    def __first(self, objs, after=None, limit=None):
+        """returns, ordered by id, at most limit of objs with an id after
+        after"""
+        if after is not None:
+            objs = (obj for obj in objs if obj.id > after)
+        if limit is None:
+            return sorted(objs, key=attrgetter("id"))
+        return heapq.nsmallest(limit, objs, key=attrgetter("id"))
+
+    def search_places(self, states=(), cities=(), amenities=(),
+                      after=None, limit=None, fields=None):
+        """
+        returns, ordered by id, the places located in the given states or
+        cities (all the places if there are none) that have all the given
+        amenities, keeping at most limit of those with an id after after;
+        fields is accepted for compatibility with DBStorage
+        """
+        self.__hydrate("Place")
+        candidates = []
+        if states or cities:
+            city_ids = set(cities)
+            for state_id in states:
+                city_ids.update(city.id for city in
+                                self.related(City, "state_id", state_id))
+            index = self.__references.get(("Place", "city_id"), {})
+            keys = set()
+            for city_id in city_ids:
+                keys.update(index.get(city_id, {}))
+            candidates.append(keys)
+        for amenity_id in set(amenities):
+            if self.get(Amenity, amenity_id) is None:
+                return []
+            candidates.append(self.__amenities.get(amenity_id, set()))
+        partition = self.__partitions().get("Place", {})
+        if candidates:
+            candidates.sort(key=len)
+            keys = candidates[0].intersection(*candidates[1:])
+            places = (partition[key] for key in keys if key in partition)
+        else:
+            places = self.all(Place).values()
+        return self.__first(places, after, limit)
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            with FileStorage.__writer:
+                self.__put(key, obj)
+                self.__dirty[key] = obj
+
+    def changed(self, obj, attr, old_value):
+        """updates the indexes after attr of a stored obj was assigned"""
+        name = obj.__class__.__name__
+        key = name + "." + str(getattr(obj, "id", None))
+        if self.__lookup(key) is not obj:
+            return
+        with FileStorage.__writer:
+            self.__partitions()
+            self.__dirty[key] = obj
+            self.__touch(name)
+            if attr in foreign_keys.get(name, ()):
+                self.__drop_reference(name, attr, old_value, key)
+                index = self.__references.setdefault((name, attr), {})
+                value = self.__reference_key(getattr(obj, attr, None))
+                index.setdefault(value, {})[key] = obj
+            elif attr == "amenity_ids" and name == "Place":
+                self.__unlink_amenities(key, old_value)
+                self.__link_amenities(key, obj.amenity_ids)
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
+        """serializes __objects to the JSON file (path: __file_path), or
+        only the objects changed since the last save to its journal"""
+        if not self.__group_commit:
+            self.__flush()
+            return
+        commit = FileStorage.__commit
+        with commit:
+            FileStorage.__requested += 1
+            ticket = self.__requested
+            if self.__flusher is None:
+                FileStorage.__flusher = threading.Thread(
+                    target=self.__flush_batches, daemon=True)
+                self.__flusher.start()
+            commit.notify_all()
+            while self.__committed < ticket:
+                commit.wait()
+            failure = self.__failure
+        if failure and failure[0] <= ticket <= failure[1]:
+            raise failure[2]
+
+    def __flush_batches(self):
+        """writes the pending saves in batches, for as long as the process
+        runs"""
+        commit = FileStorage.__commit
+        while True:
+            with commit:
+                while self.__requested == self.__committed:
+                    commit.wait()
+                deadline = time.monotonic() + commit_latency
+                last = self.__requested
+                while True:
+                    timeout = min(commit_window, deadline - time.monotonic())
+                    if timeout <= 0 or not commit.wait(timeout) or \
+                            self.__requested == last:
+                        break
+                    last = self.__requested
+                first = self.__committed + 1
+            failure = None
+            try:
+                self.__flush()
+            except Exception as e:
+                failure = (first, last, e)
+            with commit:
+                FileStorage.__failure = failure
+                FileStorage.__committed = last
+                commit.notify_all()
+
+    def __flush(self):
+        """writes the changes made since the last flush"""
+        self.__partitions()
+        with FileStorage.__lock:
+            with FileStorage.__writer:
+                dirty = FileStorage.__dirty
+                FileStorage.__dirty = {}
+                for key in dirty:
+                    self.__serialized.pop(key, None)
+            if self.__journaling and not self.__rewrite:
+                self.__append(dirty)
+            else:
+                self.__write()
+        if self.__journaled >= journal_max and not self.__compacting:
+            threading.Thread(target=self.compact, daemon=True).start()
+
+    def __write(self):
+        """rewrites the whole JSON file and discards the journal"""
+        tmp = self.__file_path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.__serialize(), f)
+            if self.__group_commit:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, self.__file_path)
+        if self.__group_commit:
+            self.__sync_directory()
+        for path in self.__journals():
+            if os.path.exists(path):
+                os.remove(path)
+        FileStorage.__stamps = (self.__stat(self.__file_path), None)
+        FileStorage.__journal_at = (None, 0)
+        FileStorage.__rewrite = False
+        FileStorage.__journaled = 0
+        FileStorage.__generation += 1
+
+    def __serialize(self):
+        """returns the dictionary of the serialized __objects, calling
+        to_dict() only on the objects changed since it was last called,
+        and of the pending records"""
+        serialized = self.__serialized
         json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        for records in list(self.__pending.values()):
+            json_objects.update(records)
+        for partition in list(self.__partitions().values()):
+            for key, obj in list(partition.items()):
+                value = serialized.get(key)
+                if value is None:
+                    value = obj.to_dict()
+                    if self.__caching:
+                        serialized[key] = value
+                json_objects[key] = value
+        return json_objects
 
-    def reload(self):
-        """deserializes the JSON file to __objects"""
+    def __append(self, dirty):
+        """appends one record per changed object to the journal"""
+        if not dirty:
+            return
+        lines = []
+        for key, obj in dirty.items():
+            value = None
+            if obj is not None:
+                value = obj.to_dict()
+                if self.__caching:
+                    self.__serialized[key] = value
+            lines.append(json.dumps({"key": key, "value": value}) + "\n")
+        with open(self.__journals()[1], 'ab') as f:
+            start = f.tell()
+            f.write("".join(lines).encode())
+            end = f.tell()
+            if self.__group_commit:
+                f.flush()
+                os.fsync(f.fileno())
+            inode = os.fstat(f.fileno()).st_ino
+        if self.__group_commit and start == 0:
+            self.__sync_directory()
+        FileStorage.__journaled += len(lines)
+        at_inode, offset = self.__journal_at
+        if start == offset and at_inode in (None, inode):
+            FileStorage.__journal_at = (inode, end)
+
+    def __sync_directory(self):
+        """makes the files created or renamed in the directory of the JSON
+        file durable"""
+        fd = os.open(os.path.dirname(os.path.abspath(self.__file_path)),
+                     os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def __stat(self, path):
+        """returns (inode, mtime, size) of the file at path, or None"""
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except Exception:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def __journals(self):
+        """returns the paths of the journal being compacted and of the
+        journal being appended to, in replay order"""
+        return (self.__file_path + ".journal.1",
+                self.__file_path + ".journal")
+
+    def __replay(self, path, records, offset=0):
+        """applies the records of the journal at path from offset to
+        records, or to __objects when records is None, and returns how
+        many it read and the offset of the first incomplete line"""
+        count = 0
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    offset += len(line)
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    count += 1
+                    key, value = record["key"], record["value"]
+                    if records is not None:
+                        records[key] = value
+                    elif value is None:
+                        self.__remove(key)
+                        self.__dirty.pop(key, None)
+                        self.__serialized.pop(key, None)
+                    else:
+                        self.__load(key, value)
+        except OSError:
             pass
+        return count, offset
+
+    def __load(self, key, value):
+        """builds the object described by value and stores it under key,
+        or leaves value pending in lazy mode if key has no object yet"""
+        self.__dirty.pop(key, None)
+        if self.__lazy and self.__lookup(key) is None:
+            name = classes[value["__class__"]].__name__
+            self.__pending.setdefault(name, {})[key] = value
+            self.__touch(name)
+            return
+        self.__put(key, self.__build(value))
+
+    def __build(self, value):
+        """returns the object described by value, a record written by
+        save(), without going through __init__: the datetimes are parsed
+        by fromisoformat, the attributes are set at once and the password,
+        already hashed, is not hashed again"""
+        cls = classes[value["__class__"]]
+        obj = cls.__new__(cls)
+        attrs = dict(value)
+        del attrs["__class__"]
+        for attr in ("created_at", "updated_at"):
+            text = attrs.get(attr)
+            if text and isinstance(text, str):
+                attrs[attr] = datetime.fromisoformat(text)
+            else:
+                attrs[attr] = datetime.utcnow()
+        if attrs.get("id") is None:
+            attrs["id"] = str(uuid.uuid4())
+        obj._load(attrs)
+        return obj
+
+    def compact(self):
+        """folds the journal back into the JSON file"""
+        rotated, current = self.__journals()
+        with FileStorage.__lock:
+            if self.__compacting:
+                return
+            if not os.path.exists(rotated):
+                if not os.path.exists(current):
+                    return
+                stamp = self.__stat(current)
+                os.replace(current, rotated)
+                if stamp and self.__journal_at[1] == stamp[2]:
+                    FileStorage.__stamps = (self.__stamps[0],
+                                            self.__stat(rotated))
+                FileStorage.__journal_at = (None, 0)
+                FileStorage.__journaled = 0
+            FileStorage.__compacting = True
+            generation = self.__generation
+        try:
+            changes = {}
+            self.__replay(rotated, changes)
+            tmp = self.__file_path + ".compact"
+            try:
+                f = open(self.__file_path, 'r')
+            except OSError:
+                f = None
+            try:
+                self.__fold(tmp, changes, iter_records(f) if f else ())
+            except ValueError:
+                self.__fold(tmp, changes)
+            finally:
+                if f:
+                    f.close()
+            with FileStorage.__lock:
+                if generation == self.__generation:
+                    stamps = (self.__stat(self.__file_path),
+                              self.__stat(rotated))
+                    os.replace(tmp, self.__file_path)
+                    if self.__group_commit:
+                        self.__sync_directory()
+                    os.remove(rotated)
+                    if stamps == self.__stamps:
+                        FileStorage.__stamps = (
+                            self.__stat(self.__file_path), None)
+                else:
+                    os.remove(tmp)
+        finally:
+            FileStorage.__compacting = False
+
+    def __fold(self, tmp, changes, records=()):
+        """writes to tmp the JSON object of the (key, value) pairs records,
+        read one at a time, with changes, the records of a journal, applied
+        to them"""
+        seen = set()
+
+        def merge():
+            """yields the records with their changes, then the new ones"""
+            for key, value in records:
+                if key in changes:
+                    seen.add(key)
+                    value = changes[key]
+                yield key, value
+            for key, value in changes.items():
+                if key not in seen:
+                    yield key, value
+        with open(tmp, 'w') as f:
+            separator = "{"
+            for key, value in merge():
+                if value is not None:
+                    f.write(separator + json.dumps(key) + ": " +
+                            json.dumps(value))
+                    separator = ", "
+            f.write("{}" if separator == "{" else "}")
+            if self.__group_commit:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def reload(self):
+        """deserializes the JSON file and replays its journal to
+        __objects"""
+        with FileStorage.__writer:
+            self.__partitions()
+            rotated, current = self.__journals()
+            stamp = self.__stat(self.__file_path)
+            try:
+                with open(self.__file_path, 'r') as f:
+                    for key, value in iter_records(f):
+                        self.__load(key, value)
+            except Exception:
+                pass
+            rotated_stamp = self.__stat(rotated)
+            journal_stamp = self.__stat(current)
+            offset = 0
+            try:
+                self.__replay(rotated, None)
+                FileStorage.__journaled, offset = self.__replay(current, None)
+            except Exception:
+                pass
+            FileStorage.__stamps = (stamp, rotated_stamp)
+            FileStorage.__journal_at = (journal_stamp and journal_stamp[0],
+                                        offset)
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            with FileStorage.__writer:
+                if self.__lookup(key) is not None or \
+                        key in self.__pending.get(obj.__class__.__name__, ()):
+                    self.__remove(key)
+                    self.__dirty[key] = None
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """calls reload() if another process rewrote the JSON file since it
+        was last read or written, or only replays what was appended to its
+        journal in the meantime"""
+        rotated, current = self.__journals()
+        stamps = (self.__stat(self.__file_path), self.__stat(rotated))
+        inode, offset = self.__journal_at
+        stamp = self.__stat(current)
+        if stamps != self.__stamps or (stamp is None and offset) or \
+                (stamp and inode is not None and stamp[0] != inode):
+            self.reload()
+        elif stamp and stamp[2] > offset:
+            with FileStorage.__writer:
+                inode, offset = self.__journal_at
+                count, offset = self.__replay(current, None, offset)
+                FileStorage.__journaled += count
+                FileStorage.__journal_at = (stamp[0], offset)
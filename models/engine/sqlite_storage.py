@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+"""
+Contains the class SQLiteStorage
+"""
+
+from models.engine.db_storage import DBStorage, pool_options
+from os import getenv
+from sqlalchemy import create_engine, event
+
+
+class SQLiteStorage(DBStorage):
+    """interacts with an embedded SQLite database file"""
+
+    def create_engine(self):
+        """creates the engine connected to the SQLite database file, with
+        the connection pool of DBStorage and write-ahead logging"""
+        HBNB_SQLITE_PATH = getenv('HBNB_SQLITE_PATH', 'hbnb.db')
+        engine = create_engine('sqlite:///{}'.format(HBNB_SQLITE_PATH),
+                               connect_args={'timeout': 30,
+                                             'check_same_thread': False},
+                               **pool_options())
+
+        @event.listens_for(engine, "connect")
+        def set_pragmas(dbapi_connection, connection_record):
+            """turns on write-ahead logging and foreign keys"""
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+        return engine
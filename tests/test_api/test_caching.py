@@ -0,0 +1,172 @@
+#!/usr/bin/python3
+"""
+Contains the TestResponseCache classes
+"""
+
+from api.v1 import caching
+from api.v1.app import app
+import inspect
+import models
+from models.amenity import Amenity
+from models.engine.file_storage import FileStorage
+from models.state import State
+import os
+import pep8
+import sys
+import unittest
+from unittest import mock
+ResponseCache = caching.ResponseCache
+
+
+class TestResponseCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of ResponseCache class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.cache_f = inspect.getmembers(ResponseCache, inspect.isfunction)
+
+    def test_pep8_conformance_caching(self):
+        """Test that api/v1/caching.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/caching.py',
+                                    'tests/test_api/test_caching.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_caching_docstrings(self):
+        """Test for the docstrings of caching.py and its functions"""
+        self.assertTrue(len(caching.__doc__) >= 1,
+                        "caching.py needs a docstring")
+        for func in self.cache_f + [("etag", caching.etag),
+                                    ("conditional", caching.conditional)]:
+            self.assertTrue(func[1].__doc__,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestResponseCache(unittest.TestCase):
+    """Test the response cache of the API"""
+    def setUp(self):
+        """Serves the API from an empty storage and an empty cache"""
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__file_path = "cache_test.json"
+        self.use_cache(ResponseCache(1 << 20))
+        self.client = app.test_client()
+        self.state = State(name="California")
+        self.state.save()
+
+    def tearDown(self):
+        """Restores the storage"""
+        mock.patch.stopall()
+        FileStorage._FileStorage__objects = self.save
+        FileStorage._FileStorage__file_path = "file.json"
+        for path in ("cache_test.json", "cache_test.json.journal"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def get(self, url, **kwargs):
+        """sends a GET request for url and reads its whole body, which is
+        what caches it"""
+        response = self.client.get(url, **kwargs)
+        response.data
+        return response
+
+    def use_cache(self, cache):
+        """makes the API use cache until the end of the test"""
+        mock.patch.object(caching, "cache", cache).start()
+        mock.patch.object(sys.modules["api.v1.views.index"], "cache",
+                          cache).start()
+        self.cache = cache
+
+    def test_miss_then_hit(self):
+        """Test that a repeated GET is served from the cache"""
+        first = self.get("/api/v1/states")
+        self.assertEqual(self.cache.stats()["misses"], 1)
+        self.assertEqual(self.cache.stats()["hits"], 0)
+        second = self.get("/api/v1/states")
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second.headers["ETag"], first.headers["ETag"])
+        self.assertEqual(second.content_type, first.content_type)
+        self.assertEqual(self.get("/api/v1/states?limit=1").status_code, 200)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+    def test_not_modified(self):
+        """Test that a GET naming the current ETag gets a 304"""
+        tag = self.get("/api/v1/states").headers["ETag"]
+        response = self.get("/api/v1/states",
+                            headers={"If-None-Match": tag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(response.headers["ETag"], tag)
+
+    def test_errors_not_cached(self):
+        """Test that responses other than 200 are not cached"""
+        for i in range(2):
+            self.assertEqual(self.get("/api/v1/states/nope").status_code,
+                             404)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_invalidated_by_save_and_delete(self):
+        """Test that saving or deleting an object invalidates the cached
+        responses depending on its class only"""
+        first = self.get("/api/v1/states")
+        self.get("/api/v1/amenities")
+        other = State(name="Nevada")
+        other.save()
+        second = self.get("/api/v1/states")
+        self.assertEqual(self.cache.stats()["hits"], 0)
+        self.assertNotEqual(second.headers["ETag"], first.headers["ETag"])
+        self.assertEqual(len(second.get_json()), 2)
+        self.get("/api/v1/amenities")
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        models.storage.delete(other)
+        models.storage.save()
+        third = self.get("/api/v1/states")
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(third.data, first.data)
+        self.assertNotEqual(third.headers["ETag"], first.headers["ETag"])
+
+    def test_lru_eviction(self):
+        """Test that the least recently used responses are evicted once
+        the bodies outgrow max_bytes"""
+        Amenity(name="Wifi").save()
+        urls = ["/api/v1/states", "/api/v1/states/" + self.state.id,
+                "/api/v1/amenities"]
+        sizes = [len(self.get(url).data) for url in urls]
+        self.use_cache(ResponseCache(sizes[0] + max(sizes[1:])))
+        self.get(urls[0])
+        self.get(urls[1])
+        self.get(urls[0])
+        self.assertEqual(self.cache.stats()["evictions"], 0)
+        self.get(urls[2])
+        stats = self.cache.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["entries"], 2)
+        self.assertLessEqual(stats["bytes"], stats["max_bytes"])
+        self.get(urls[0])
+        self.get(urls[2])
+        self.assertEqual(self.cache.stats()["hits"], 3)
+        self.get(urls[1])
+        self.assertEqual(self.cache.stats()["hits"], 3)
+
+    def test_body_larger_than_cache(self):
+        """Test that a body larger than max_bytes is sent but not cached"""
+        self.use_cache(ResponseCache(10))
+        response = self.get("/api/v1/states")
+        self.assertEqual(response.get_json()[0]["id"], self.state.id)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+        self.assertEqual(self.cache.stats()["bytes"], 0)
+
+    def test_stats_endpoint(self):
+        """Test that /cache returns the statistics of the cache"""
+        self.get("/api/v1/states")
+        size = self.cache.stats()["bytes"]
+        self.get("/api/v1/states")
+        stats = self.get("/api/v1/cache").get_json()
+        self.assertEqual(stats, {"entries": 1, "bytes": size,
+                                 "max_bytes": 1 << 20, "hits": 1,
+                                 "misses": 1, "evictions": 0})
+        self.assertGreater(size, 0)
@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""
+Contains the TestFields classes
+"""
+
+from api.v1 import caching, fields
+from api.v1.app import app
+import models
+from models.amenity import Amenity
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+import os
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestFieldsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of fields.py"""
+    def test_pep8_conformance_fields(self):
+        """Test that api/v1/fields.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/fields.py',
+                                    'tests/test_api/test_fields.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_fields_docstrings(self):
+        """Test for the docstrings of fields.py and its functions"""
+        self.assertTrue(len(fields.__doc__) >= 1,
+                        "fields.py needs a docstring")
+        self.assertTrue(fields.requested_fields.__doc__,
+                        "requested_fields needs a docstring")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFields(unittest.TestCase):
+    """Test the sparse fieldsets of the GET endpoints and places_search"""
+    def setUp(self):
+        """Serves the API from a storage of a state and a place with an
+        amenity"""
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__file_path = "fields_test.json"
+        mock.patch.object(caching, "cache",
+                          caching.ResponseCache(1 << 20)).start()
+        self.client = app.test_client()
+        self.state = State(name="California")
+        self.amenity = Amenity(name="Wifi")
+        self.place = Place(name="Loft", city_id="c", user_id="u",
+                           number_rooms=2, amenity_ids=[self.amenity.id])
+        for obj in (self.state, self.amenity, self.place):
+            obj.save()
+
+    def tearDown(self):
+        """Restores the storage"""
+        mock.patch.stopall()
+        FileStorage._FileStorage__objects = self.save
+        FileStorage._FileStorage__file_path = "file.json"
+        for path in ("fields_test.json", "fields_test.json.journal"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def get(self, url):
+        """returns the JSON body of the response to a GET of url"""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def test_object(self):
+        """Test that only the requested fields of an object are sent"""
+        url = "/api/v1/states/" + self.state.id
+        self.assertEqual(self.get(url), self.state.to_dict())
+        self.assertEqual(self.get(url + "?fields=id,name"),
+                         {"id": self.state.id, "name": "California"})
+        self.assertEqual(self.get(url + "?fields= name , __class__"),
+                         {"name": "California", "__class__": "State"})
+        self.assertEqual(self.get(url + "?fields=created_at"),
+                         {"created_at": self.state.to_dict()["created_at"]})
+        self.assertEqual(self.get(url + "?fields=missing"), {})
+        self.assertEqual(self.get(url + "?fields=,"), self.state.to_dict())
+        self.assertEqual(self.get("/api/v1/places/{}?fields=number_rooms"
+                                  .format(self.place.id)),
+                         {"number_rooms": 2})
+
+    def test_collections(self):
+        """Test that only the requested fields of a collection are sent,
+        paged or not"""
+        self.assertEqual(self.get("/api/v1/states?fields=name"),
+                         [{"name": "California"}])
+        self.assertEqual(self.get("/api/v1/states?fields=id&limit=1"),
+                         [{"id": self.state.id}])
+        self.assertEqual(self.get("/api/v1/places/{}/amenities?fields=name"
+                                  .format(self.place.id)),
+                         [{"name": "Wifi"}])
+        self.assertEqual(self.get("/api/v1/states"), [self.state.to_dict()])
+
+    def test_places_search(self):
+        """Test that places_search sends the fields listed in its body"""
+        for requested in (["id", "name"], "id,name"):
+            with self.subTest(fields=requested):
+                response = self.client.post("/api/v1/places_search",
+                                            json={"fields": requested})
+                self.assertEqual(response.get_json(),
+                                 [{"id": self.place.id, "name": "Loft"}])
+        for requested in ([1], {"id": 1}, 5):
+            with self.subTest(fields=requested):
+                response = self.client.post("/api/v1/places_search",
+                                            json={"fields": requested})
+                self.assertEqual(response.status_code, 400)
@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+"""
+Contains the TestPagination classes
+"""
+
+from api.v1 import caching, pagination
+from api.v1.app import app
+import models
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.state import State
+import os
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestPaginationDocs(unittest.TestCase):
+    """Tests to check the documentation and style of pagination.py"""
+    def test_pep8_conformance_pagination(self):
+        """Test that api/v1/pagination.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/pagination.py',
+                                    'api/v1/streaming.py',
+                                    'tests/test_api/test_pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pagination_docstrings(self):
+        """Test for the docstrings of pagination.py and its functions"""
+        self.assertTrue(len(pagination.__doc__) >= 1,
+                        "pagination.py needs a docstring")
+        self.assertTrue(pagination.paginate.__doc__,
+                        "paginate needs a docstring")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestPagination(unittest.TestCase):
+    """Test the keyset pagination of the collection endpoints"""
+    def setUp(self):
+        """Serves the API from a storage of 5 states"""
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__file_path = "pagination_test.json"
+        mock.patch.object(caching, "cache",
+                          caching.ResponseCache(1 << 20)).start()
+        self.client = app.test_client()
+        self.states = [State(name=str(i)) for i in range(5)]
+        for state in self.states:
+            state.save()
+        self.ids = sorted(state.id for state in self.states)
+
+    def tearDown(self):
+        """Restores the storage"""
+        mock.patch.stopall()
+        FileStorage._FileStorage__objects = self.save
+        FileStorage._FileStorage__file_path = "file.json"
+        for path in ("pagination_test.json", "pagination_test.json.journal"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_pages(self):
+        """Test that following the Link headers lists every object once, in
+        order of id, limit at a time"""
+        url, pages = "/api/v1/states?limit=2", []
+        while url is not None:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append([state["id"] for state in response.get_json()])
+            cursor = response.headers.get("X-Next-Cursor")
+            link = response.headers.get("Link")
+            if cursor is None:
+                self.assertIsNone(link)
+                url = None
+            else:
+                self.assertEqual(cursor, pages[-1][-1])
+                self.assertTrue(link.startswith("<http://localhost/api/v1/"
+                                                "states?"))
+                self.assertTrue(link.endswith('>; rel="next"'))
+                self.assertIn("after=" + cursor, link)
+                self.assertIn("limit=2", link)
+                url = link[1:link.index(">")]
+        self.assertEqual(pages, [self.ids[0:2], self.ids[2:4], self.ids[4:]])
+
+    def test_last_page(self):
+        """Test that a page ending with the last object has no next link"""
+        response = self.client.get("/api/v1/states?limit=5")
+        self.assertEqual([state["id"] for state in response.get_json()],
+                         self.ids)
+        self.assertNotIn("Link", response.headers)
+        self.assertNotIn("X-Next-Cursor", response.headers)
+        response = self.client.get("/api/v1/states?after=" + self.ids[-1])
+        self.assertEqual(response.get_json(), [])
+        self.assertNotIn("Link", response.headers)
+
+    def test_after(self):
+        """Test that after alone lists every object following it"""
+        response = self.client.get("/api/v1/states?after=" + self.ids[1])
+        self.assertEqual([state["id"] for state in response.get_json()],
+                         self.ids[2:])
+        self.assertNotIn("X-Next-Cursor", response.headers)
+        response = self.client.get("/api/v1/states?limit=1&after=" +
+                                   self.ids[1])
+        self.assertEqual(response.get_json()[0]["id"], self.ids[2])
+        self.assertEqual(response.headers["X-Next-Cursor"], self.ids[2])
+
+    def test_invalid_limit(self):
+        """Test that a limit that is not a positive integer gets a 400"""
+        for limit in ("0", "-1", "1.5", "two", "", "%C2%B2", "%D9%A3"):
+            with self.subTest(limit=limit):
+                response = self.client.get("/api/v1/states?limit=" + limit)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(b"Invalid limit", response.data)
+
+    def test_filtered_pages(self):
+        """Test that the nested collections are paged with their filter"""
+        state = self.states[0]
+        cities = [City(name=str(i), state_id=state.id) for i in range(3)]
+        for city in cities + [City(name="other", state_id="other")]:
+            city.save()
+        ids = sorted(city.id for city in cities)
+        url = "/api/v1/states/{}/cities?limit=2".format(state.id)
+        response = self.client.get(url)
+        self.assertEqual([city["id"] for city in response.get_json()],
+                         ids[:2])
+        self.assertIn("/api/v1/states/{}/cities?".format(state.id),
+                      response.headers["Link"])
+        response = self.client.get(url + "&after=" + ids[1])
+        self.assertEqual([city["id"] for city in response.get_json()],
+                         ids[2:])
+        self.assertNotIn("Link", response.headers)
+        response = self.client.get(url + "&state_id=x&fields=id")
+        self.assertEqual(response.get_json(), [{"id": id} for id in ids[:2]])
+        link = response.headers["Link"]
+        self.assertTrue(link.startswith("<http://localhost/api/v1/states/{}"
+                                        "/cities?".format(state.id)))
+        self.assertIn("state_id=x", link)
+        self.assertIn("fields=id", link)
+
+    def test_streamed_array(self):
+        """Test that an unpaged collection is streamed as one JSON array"""
+        response = self.client.get("/api/v1/states")
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, "application/json")
+        states = response.get_json()
+        self.assertEqual(sorted(state["id"] for state in states), self.ids)
+        self.assertEqual(states[0], models.storage.get(
+            State, states[0]["id"]).to_dict())
+        self.assertNotIn("Link", response.headers)
+        response = self.client.get("/api/v1/amenities")
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.data, b"[]\n")
@@ -0,0 +1,142 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesSearch classes
+"""
+
+from api.v1.app import app
+import json
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+import os
+import pep8
+import unittest
+
+
+class TestPlacesSearchDocs(unittest.TestCase):
+    """Tests to check the style of the places views"""
+    def test_pep8_conformance_places(self):
+        """Test that api/v1/views/places.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places.py',
+                                    'tests/test_api/test_places_search.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestPlacesSearch(unittest.TestCase):
+    """Test the paginated and streamed responses of places_search"""
+    def setUp(self):
+        """Serves the API from a storage of 6 places in 3 cities of 2
+        states, half of them with a pool"""
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__file_path = "search_test.json"
+        self.client = app.test_client()
+        self.states = [State(name=str(i)) for i in range(2)]
+        self.cities = [City(name=str(i), state_id=self.states[i // 2].id)
+                       for i in range(3)]
+        self.pool = Amenity(name="Pool")
+        self.places = []
+        for i in range(6):
+            place = Place(name=str(i), city_id=self.cities[i % 3].id)
+            if i % 2:
+                place.amenity_ids = [self.pool.id]
+            self.places.append(place)
+        for obj in self.states + self.cities + [self.pool] + self.places:
+            obj.save()
+
+    def tearDown(self):
+        """Restores the storage"""
+        FileStorage._FileStorage__objects = self.save
+        FileStorage._FileStorage__file_path = "file.json"
+        for path in ("search_test.json", "search_test.json.journal"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def search(self, **body):
+        """returns the response of places_search to body"""
+        return self.client.post("/api/v1/places_search", json=body)
+
+    def ids(self, places):
+        """returns the sorted ids of places"""
+        return sorted(place.id for place in places)
+
+    def test_search(self):
+        """Test that places are filtered by location and amenities"""
+        response = self.search()
+        self.assertTrue(response.is_streamed)
+        self.assertEqual([place["id"] for place in response.get_json()],
+                         self.ids(self.places))
+        response = self.search(states=[self.states[1].id],
+                               cities=[self.cities[0].id])
+        self.assertEqual([place["id"] for place in response.get_json()],
+                         self.ids(place for place in self.places
+                                  if place.city_id != self.cities[1].id))
+        response = self.search(cities=[self.cities[0].id],
+                               amenities=[self.pool.id])
+        self.assertEqual([place["id"] for place in response.get_json()],
+                         [self.places[3].id])
+        response = self.search(states=None, cities=None, amenities=None)
+        self.assertEqual(len(response.get_json()), 6)
+
+    def test_pages(self):
+        """Test that following X-Next-Cursor lists every place once"""
+        after, pages = None, []
+        while True:
+            response = self.search(limit=4, after=after,
+                                   amenities=[self.pool.id])
+            self.assertEqual(response.status_code, 200)
+            pages.append([place["id"] for place in response.get_json()])
+            after = response.headers.get("X-Next-Cursor")
+            if after is None:
+                break
+            self.assertEqual(after, pages[-1][-1])
+        self.assertEqual(pages, [self.ids(self.places[1::2])])
+        response = self.search(limit=2)
+        self.assertEqual([place["id"] for place in response.get_json()],
+                         self.ids(self.places)[:2])
+        self.assertEqual(response.headers["X-Next-Cursor"],
+                         self.ids(self.places)[1])
+        response = self.search(limit=2, after=self.ids(self.places)[3])
+        self.assertEqual([place["id"] for place in response.get_json()],
+                         self.ids(self.places)[4:])
+        self.assertNotIn("X-Next-Cursor", response.headers)
+
+    def test_ndjson(self):
+        """Test that the places are sent as NDJSON when it is preferred"""
+        array = self.search(limit=5).get_json()
+        response = self.client.post("/api/v1/places_search",
+                                    json={"limit": 5},
+                                    headers={"Accept":
+                                             "application/x-ndjson"})
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = response.get_data(as_text=True).split("\n")
+        self.assertEqual(lines[-1], "")
+        self.assertEqual([json.loads(line) for line in lines[:-1]], array)
+        self.assertEqual(response.headers["X-Next-Cursor"], array[-1]["id"])
+        response = self.client.post("/api/v1/places_search",
+                                    json={"states": ["missing"]},
+                                    headers={"Accept":
+                                             "application/x-ndjson"})
+        self.assertEqual(response.data, b"")
+
+    def test_invalid(self):
+        """Test that invalid bodies get a 400"""
+        bodies = [{"limit": 0}, {"limit": -1}, {"limit": "2"},
+                  {"limit": 1.5}, {"limit": True}, {"after": 5},
+                  {"states": "abc"}, {"cities": {"a": "b"}},
+                  {"amenities": [1]}, {"states": 5}, {"cities": [None]}]
+        for body in bodies:
+            with self.subTest(body=body):
+                response = self.search(**body)
+                self.assertEqual(response.status_code, 400)
+        for data in ("[]", "not json"):
+            response = self.client.post("/api/v1/places_search", data=data,
+                                        content_type="application/json")
+            self.assertEqual(response.status_code, 400)
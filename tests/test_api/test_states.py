@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""
+Contains the TestStates classes
+"""
+
+from api.v1 import caching
+from api.v1.app import app
+import models
+from models.engine.file_storage import FileStorage
+from models.state import State
+import os
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestStatesDocs(unittest.TestCase):
+    """Tests to check the style of the states views"""
+    def test_pep8_conformance_states(self):
+        """Test that api/v1/views/states.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/states.py',
+                                    'tests/test_api/test_states.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestStates(unittest.TestCase):
+    """Test the views of the State objects"""
+    def setUp(self):
+        """Serves the API from a storage of one state"""
+        self.save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__file_path = "states_test.json"
+        mock.patch.object(caching, "cache",
+                          caching.ResponseCache(1 << 20)).start()
+        self.client = app.test_client()
+        self.state = State(name="California")
+        self.state.save()
+
+    def tearDown(self):
+        """Restores the storage"""
+        mock.patch.stopall()
+        FileStorage._FileStorage__objects = self.save
+        FileStorage._FileStorage__file_path = "file.json"
+        for path in ("states_test.json", "states_test.json.journal"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_update_internal_names(self):
+        """Test that attributes named like the internal ones of the models
+        are stored as plain attributes"""
+        url = "/api/v1/states/" + self.state.id
+        created_at = self.state.to_dict()["created_at"]
+        body = {"_created": "x", "_updated": "y", "_extras": 1,
+                "name": "Nevada"}
+        response = self.client.put(url, json=body)
+        self.assertEqual(response.status_code, 200)
+        state = self.client.get(url).get_json()
+        self.assertEqual(state["name"], "Nevada")
+        self.assertEqual(state["created_at"], created_at)
+        self.assertEqual(state["_created"], "x")
+        self.assertEqual(state["_extras"], 1)
+        response = self.client.post("/api/v1/states", json={"name": "Utah"})
+        self.assertEqual(response.status_code, 201)
@@ -138,6 +138,34 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_to_dict_whole_seconds(self):
+        """test that datetimes without microseconds keep them in to_dict"""
+        bm = BaseModel()
+        bm.created_at = datetime(2017, 9, 28, 21, 3, 54)
+        self.assertEqual(bm.to_dict()["created_at"],
+                         "2017-09-28T21:03:54.000000")
+
+    def test_to_dict_fields(self):
+        """test that to_dict only returns the requested fields"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        bm = BaseModel()
+        bm.name = "Holberton"
+        self.assertEqual(bm.to_dict(["name", "missing"]),
+                         {"name": "Holberton"})
+        self.assertEqual(bm.to_dict(["updated_at", "__class__"]),
+                         {"updated_at": bm.updated_at.strftime(t_format),
+                          "__class__": "BaseModel"})
+        self.assertEqual(bm.to_dict([]), {})
+
+    def test_to_dict_undeclared(self):
+        """test that to_dict keeps the attributes the class does not
+        declare, in the order they were set"""
+        bm = BaseModel(zeta=1)
+        bm.alpha = 2
+        keys = list(bm.to_dict())
+        self.assertLess(keys.index("zeta"), keys.index("alpha"))
+        self.assertEqual(bm.to_dict()["alpha"], 2)
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
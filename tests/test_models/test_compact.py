@@ -0,0 +1,189 @@
+#!/usr/bin/python3
+"""
+Contains the TestCompactDocs and TestCompactModel classes
+"""
+
+from datetime import datetime, timedelta, timezone
+import inspect
+import json
+import models
+from models import compact
+from models.place import Place
+from models.user import User
+import os
+import pep8
+import subprocess
+import sys
+import unittest
+CompactModel = compact.CompactModel
+
+
+class Thing(CompactModel):
+    """compact model used by the tests"""
+    name = ""
+    parent_id = ""
+    child_ids = []
+
+    @property
+    def label(self):
+        """read only attribute"""
+        return "thing " + self.name
+
+
+class TestCompactDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the compact models"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.compact_f = inspect.getmembers(CompactModel, inspect.isfunction)
+
+    def test_pep8_conformance_compact(self):
+        """Test that models/compact.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/compact.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_compact(self):
+        """Test that tests/test_models/test_compact.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_compact.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_compact_module_docstring(self):
+        """Test for the compact.py module docstring"""
+        self.assertIsNot(compact.__doc__, None,
+                         "compact.py needs a docstring")
+        self.assertTrue(len(compact.__doc__) >= 1,
+                        "compact.py needs a docstring")
+
+    def test_compact_class_docstring(self):
+        """Test for the CompactModel class docstring"""
+        self.assertIsNot(CompactModel.__doc__, None,
+                         "CompactModel class needs a docstring")
+        self.assertTrue(len(CompactModel.__doc__) >= 1,
+                        "CompactModel class needs a docstring")
+
+    def test_compact_func_docstrings(self):
+        """Test for the presence of docstrings in CompactModel methods"""
+        for func in self.compact_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestCompactModel(unittest.TestCase):
+    """Test the CompactModel class"""
+    def test_slots(self):
+        """Test that the default values become slots"""
+        self.assertEqual(Thing.__slots__, ("name", "parent_id", "child_ids"))
+        self.assertEqual(Thing._fields, ("id", "created_at", "updated_at",
+                                         "name", "parent_id", "child_ids"))
+        thing = Thing()
+        self.assertEqual(thing.name, "")
+        self.assertEqual(thing.child_ids, [])
+        thing.name = "box"
+        self.assertEqual(thing.label, "thing box")
+        self.assertEqual(thing.__dict__, {"name": "box"})
+        with self.assertRaises(AttributeError):
+            thing.label = "crate"
+        with self.assertRaises(AttributeError):
+            thing.missing
+
+    def test_extras(self):
+        """Test that attributes without a slot are kept aside"""
+        thing = Thing()
+        thing.color = "red"
+        self.assertEqual(thing.color, "red")
+        self.assertEqual(thing.__dict__, {"color": "red"})
+        with self.assertRaises(TypeError):
+            thing.__dict__["color"] = "blue"
+        with self.assertRaises(TypeError):
+            thing.__dict__.update(color="blue")
+        self.assertEqual(thing.color, "red")
+        attrs = thing.__dict__.copy()
+        attrs["color"] = "blue"
+        self.assertEqual(attrs, {"color": "blue"})
+
+    def test_internal_slots(self):
+        """Test that the slots holding the datetimes and the extras cannot
+        be set by name"""
+        thing = Thing()
+        now = datetime(2017, 9, 28, 21, 3, 54, 52298)
+        thing.created_at = now
+        thing._created = "x"
+        thing._extras = 1
+        thing.save = 2
+        self.assertEqual(thing.created_at, now)
+        self.assertIs(type(thing._created), int)
+        self.assertEqual(thing.__dict__, {"created_at": now, "_created": "x",
+                                          "_extras": 1, "save": 2})
+        thing.updated_at = now
+        self.assertEqual(thing.updated_at, now)
+
+    def test_datetimes(self):
+        """Test that datetimes are stored as integers"""
+        thing = Thing()
+        now = datetime(2017, 9, 28, 21, 3, 54, 52298)
+        thing.created_at = now
+        self.assertIs(type(thing._created), int)
+        self.assertEqual(thing.created_at, now)
+        thing.updated_at = now
+        self.assertEqual(thing.__dict__, {"created_at": now,
+                                          "updated_at": now})
+        thing.updated_at = now.replace(tzinfo=timezone(timedelta(hours=2)))
+        self.assertEqual(thing.updated_at, now - timedelta(hours=2))
+        thing.created_at = "2017-09-28T21:03:54.052298"
+        self.assertEqual(thing.created_at, now)
+        with self.assertRaises(ValueError):
+            thing.created_at = "yesterday"
+
+    def test_interned_ids(self):
+        """Test that ids and foreign keys share their strings"""
+        parent, child = Thing(), Thing()
+        parent.id = "".join(["parent", "-", "id"])
+        child.parent_id = "".join(["parent", "-", "id"])
+        child.child_ids = ["".join(["parent", "-", "id"])]
+        self.assertIs(child.parent_id, parent.id)
+        self.assertIs(child.child_ids[0], parent.id)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_models(self):
+        """Test that Place and User built as compact models in another
+        process give the same to_dict() as the models built here"""
+        kwargs = [{"__class__": "Place", "id": "p", "name": "Loft",
+                   "city_id": "c", "user_id": "u", "number_rooms": 2,
+                   "latitude": 1.5, "amenity_ids": ["a", "b"],
+                   "created_at": "2017-09-28T21:03:54.052298",
+                   "updated_at": "2017-09-28T21:03:55.000000"},
+                  {"__class__": "User", "id": "u", "email": "a@b.c",
+                   "password": "pwd", "first_name": "Ada", "nickname": "A",
+                   "created_at": "2017-09-28T21:03:54.052298",
+                   "updated_at": "2017-09-28T21:03:54.052298"}]
+        script = """if True:
+            import json, sys
+            from models.compact import CompactModel
+            from models.place import Place
+            from models.user import User
+            classes = {"Place": Place, "User": User}
+            objs = [classes[kw["__class__"]](**kw)
+                    for kw in json.load(sys.stdin)]
+            assert all(isinstance(obj, CompactModel) for obj in objs)
+            assert not any(hasattr(obj, "__weakref__") for obj in objs)
+            json.dump([obj.to_dict() for obj in objs], sys.stdout)
+        """
+        env = dict(os.environ, HBNB_FILE_COMPACT="1", HBNB_FILE_LAZY="1")
+        env.pop("HBNB_TYPE_STORAGE", None)
+        root = os.path.dirname(os.path.dirname(models.__file__))
+        result = subprocess.run([sys.executable, "-c", script], cwd=root,
+                                env=env, input=json.dumps(kwargs),
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        classes = {"Place": Place, "User": User}
+        expected = [classes[kw["__class__"]](**kw).to_dict()
+                    for kw in kwargs]
+        self.assertEqual(json.loads(result.stdout), expected)
+        self.assertEqual(expected[1]["password"],
+                         "9003d1df22eb4d3820015070385194c8")
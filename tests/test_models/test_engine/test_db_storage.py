@@ -17,7 +17,9 @@ from models.user import User
 import json
 import os
 import pep8
+import sqlalchemy
 import unittest
+from unittest import mock
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
            "Review": Review, "State": State, "User": User}
@@ -94,3 +96,40 @@ class TestFileStorage(unittest.TestCase):
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_save(self):
         """Test that save properly saves objects to file.json"""
+
+
+class TestDBStoragePool(unittest.TestCase):
+    """Test the connection pool settings and statistics"""
+    def test_pool_options(self):
+        """Test that the pool is set up from the environment"""
+        env = {"HBNB_DB_POOL_SIZE": "2", "HBNB_DB_MAX_OVERFLOW": "1",
+               "HBNB_DB_POOL_TIMEOUT": "0.1", "HBNB_DB_POOL_RECYCLE": "60",
+               "HBNB_DB_POOL_PRE_PING": "0"}
+        with mock.patch.dict(os.environ, env):
+            options = db_storage.pool_options()
+        engine = sqlalchemy.create_engine("sqlite://", **options)
+        self.assertIsInstance(engine.pool, db_storage.TimedQueuePool)
+        self.assertEqual(engine.pool.size(), 2)
+        self.assertEqual(engine.pool._recycle, 60)
+        self.assertFalse(engine.pool._pre_ping)
+        engine.dispose()
+
+    def test_pool_stats(self):
+        """Test that the pool reports its usage and wait times"""
+        engine = sqlalchemy.create_engine(
+            "sqlite://", poolclass=db_storage.TimedQueuePool,
+            pool_size=2, max_overflow=1, pool_timeout=0.1)
+        connections = [engine.connect() for i in range(3)]
+        stats = engine.pool.stats()
+        self.assertEqual(stats["checked_out"], 3)
+        self.assertEqual(stats["overflow"], 1)
+        self.assertEqual(stats["checkouts"], 3)
+        with self.assertRaises(sqlalchemy.exc.TimeoutError):
+            engine.connect()
+        stats = engine.pool.stats()
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertGreaterEqual(stats["wait_max"], 0.1)
+        for connection in connections:
+            connection.close()
+        self.assertEqual(engine.pool.stats()["checked_out"], 0)
+        engine.dispose()
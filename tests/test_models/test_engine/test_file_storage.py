@@ -5,6 +5,7 @@ Contains the TestFileStorageDocs classes
 
 from datetime import datetime
 import inspect
+import io
 import models
 from models.engine import file_storage
 from models.amenity import Amenity
@@ -17,7 +18,10 @@ from models.user import User
 import json
 import os
 import pep8
+import threading
+import time
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -158,3 +162,540 @@ class TestFileStorage(unittest.TestCase):
         with open("file.json", "r") as f:
             js = f.read()
         self.assertEqual(json.loads(string), json.loads(js))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_by_class(self):
+        """Test that all(cls) only returns objects of that class"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State()
+        city = City()
+        storage.new(state)
+        storage.new(city)
+        self.assertEqual(storage.all(State), {"State." + state.id: state})
+        self.assertEqual(storage.all("City"), {"City." + city.id: city})
+        self.assertEqual(storage.all(Place), {})
+        storage.all(State).clear()
+        self.assertEqual(storage.count(State), 1)
+        storage.delete(state)
+        self.assertEqual(storage.all(State), {})
+        self.assertEqual(storage.count(State), 0)
+        self.assertEqual(storage.count(), 1)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_related(self):
+        """Test that the reverse foreign key indexes follow changes"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State()
+        other = State()
+        city = City(state_id=state.id)
+        for obj in (state, other, city):
+            storage.new(obj)
+        self.assertEqual(storage.related(City, "state_id", state.id), [city])
+        self.assertEqual(storage.related(City, "state_id", other.id), [])
+        city.state_id = other.id
+        self.assertEqual(storage.related(City, "state_id", state.id), [])
+        self.assertEqual(storage.related(City, "state_id", other.id), [city])
+        storage.delete(city)
+        self.assertEqual(storage.related(City, "state_id", other.id), [])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal(self):
+        """Test that journaled saves are replayed and compacted"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__file_path = "journal_test.json"
+        FileStorage._FileStorage__journaling = True
+        try:
+            state = State(name="California")
+            city = City(name="Fresno")
+            storage.new(state)
+            storage.new(city)
+            storage.save()
+            self.assertFalse(os.path.exists("journal_test.json.journal"))
+            state.name = "Nevada"
+            storage.delete(city)
+            other = State(name="Utah")
+            storage.new(other)
+            storage.save()
+            with open("journal_test.json.journal", "r") as f:
+                self.assertEqual(len(f.readlines()), 3)
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(storage.get(State, state.id).name, "Nevada")
+            self.assertIsNone(storage.get(City, city.id))
+            storage.compact()
+            self.assertFalse(os.path.exists("journal_test.json.journal"))
+            with open("journal_test.json", "r") as f:
+                text = f.read()
+            js = json.loads(text)
+            self.assertEqual(text, json.dumps(js))
+            self.assertEqual(list(js), ["State." + state.id,
+                                        "State." + other.id])
+            self.assertEqual(js["State." + state.id]["name"], "Nevada")
+            storage.delete(state)
+            storage.delete(other)
+            storage.save()
+            storage.compact()
+            with open("journal_test.json", "r") as f:
+                self.assertEqual(f.read(), "{}")
+        finally:
+            FileStorage._FileStorage__objects = save
+            FileStorage._FileStorage__file_path = "file.json"
+            FileStorage._FileStorage__journaling = False
+            for path in ("journal_test.json", "journal_test.json.journal"):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    @unittest.skipIf(models.compact_models, "compact models are not cached")
+    def test_save_only_serializes_changes(self):
+        """Test that save only calls to_dict on the changed objects"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        states = [State(name=str(i)) for i in range(3)]
+        for state in states:
+            storage.new(state)
+        storage.save()
+        states[1].name = "changed"
+        with mock.patch.object(State, "to_dict",
+                               autospec=True,
+                               side_effect=BaseModel.to_dict) as to_dict:
+            storage.save()
+            self.assertEqual(to_dict.call_count, 1)
+            storage.delete(states[0])
+            storage.save()
+            self.assertEqual(to_dict.call_count, 1)
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        self.assertEqual(js["State." + states[1].id]["name"], "changed")
+        self.assertNotIn("State." + states[0].id, js)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_keeps_external_changes(self):
+        """Test that a save after close does not write back the objects
+        that another writer changed"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__file_path = "external_test.json"
+        try:
+            for journaling in (False, True):
+                with self.subTest(journaling=journaling):
+                    FileStorage._FileStorage__objects = {}
+                    FileStorage._FileStorage__journaling = journaling
+                    state = State(name="California")
+                    storage.new(state)
+                    storage.save()
+                    record = dict(state.to_dict(), name="Nevada")
+                    key = "State." + state.id
+                    if journaling:
+                        with open("external_test.json.journal", "a") as f:
+                            f.write(json.dumps({"key": key,
+                                                "value": record}) + "\n")
+                    else:
+                        with open("external_test.json", "w") as f:
+                            json.dump({key: record}, f)
+                    storage.close()
+                    self.assertEqual(storage.get(State, state.id).name,
+                                     "Nevada")
+                    FileStorage._FileStorage__journaling = False
+                    storage.new(State(name="Utah"))
+                    storage.save()
+                    with open("external_test.json", "r") as f:
+                        self.assertEqual(json.load(f)[key]["name"],
+                                         "Nevada")
+        finally:
+            FileStorage._FileStorage__objects = save
+            FileStorage._FileStorage__file_path = "file.json"
+            FileStorage._FileStorage__journaling = file_storage.journal
+            for path in ("external_test.json",
+                         "external_test.json.journal"):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close(self):
+        """Test that close only reads what other writers changed"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__file_path = "close_test.json"
+        FileStorage._FileStorage__journaling = True
+        try:
+            state = State(name="California")
+            storage.new(state)
+            storage.save()
+            with mock.patch.object(FileStorage, "reload") as reload:
+                storage.close()
+                self.assertFalse(reload.called)
+            other = State(name="Nevada").to_dict()
+            with open("close_test.json.journal", "a") as f:
+                f.write(json.dumps({"key": "State." + other["id"],
+                                    "value": other}) + "\n")
+            with mock.patch.object(FileStorage, "reload") as reload:
+                storage.close()
+                self.assertFalse(reload.called)
+            self.assertEqual(storage.get(State, other["id"]).name, "Nevada")
+            third = State(name="Utah").to_dict()
+            with open("close_test.json", "w") as f:
+                json.dump({"State." + third["id"]: third}, f)
+            storage.close()
+            self.assertEqual(storage.get(State, third["id"]).name, "Utah")
+            self.assertEqual(storage.count(State), 3)
+        finally:
+            FileStorage._FileStorage__objects = save
+            FileStorage._FileStorage__file_path = "file.json"
+            FileStorage._FileStorage__journaling = False
+            for path in ("close_test.json", "close_test.json.journal"):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_group_commit(self):
+        """Test that concurrent saves are written in batches"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__group_commit = True
+        states = [State(name=str(i)) for i in range(10)]
+
+        def create(state):
+            """saves a new state"""
+            storage.new(state)
+            storage.save()
+        threads = [threading.Thread(target=create, args=(state,))
+                   for state in states]
+        requested = FileStorage._FileStorage__requested + len(states)
+        flush = FileStorage._FileStorage__flush
+
+        def flush_after_saves(self):
+            """waits for every save before the first flush, so that the
+            saves not in the first batch all join the second one"""
+            deadline = time.monotonic() + 10
+            while FileStorage._FileStorage__requested < requested and \
+                    time.monotonic() < deadline:
+                time.sleep(0.001)
+            flush(self)
+        try:
+            with mock.patch.object(FileStorage, "_FileStorage__flush",
+                                   autospec=True,
+                                   side_effect=flush_after_saves) as flushes:
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            self.assertLessEqual(flushes.call_count, 2)
+            with open("file.json", "r") as f:
+                js = json.load(f)
+            for state in states:
+                self.assertIn("State." + state.id, js)
+        finally:
+            FileStorage._FileStorage__objects = save
+            FileStorage._FileStorage__group_commit = False
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_snapshot(self):
+        """Test that writes never change a dictionary returned by all"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        errors = []
+        state = State()
+        storage.new(state)
+        snapshot = storage.all()
+        other = State()
+        storage.new(other)
+        storage.delete(state)
+        self.assertEqual(list(snapshot), ["State." + state.id])
+        self.assertIs(FileStorage._FileStorage__objects, snapshot)
+        self.assertIs(storage.get(State, other.id), other)
+        self.assertIsNone(storage.get(State, state.id))
+        self.assertEqual(storage.count(State), 1)
+        self.assertEqual(list(storage.all()), ["State." + other.id])
+
+        def write():
+            """creates and deletes objects"""
+            for i in range(2000):
+                obj = City()
+                storage.new(obj)
+                storage.delete(obj)
+
+        def read():
+            """iterates over all the objects"""
+            try:
+                for i in range(200):
+                    for key in storage.all():
+                        pass
+                    storage.save()
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=write)]
+        threads += [threading.Thread(target=read) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_counts(self):
+        """Test that counts returns the number of objects of each class"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        for value in (State, State, City):
+            storage.new(value())
+        counts = storage.counts()
+        self.assertEqual(counts["State"], 2)
+        self.assertEqual(counts["City"], 1)
+        self.assertEqual(counts["Place"], 0)
+        self.assertEqual(sum(counts.values()), storage.count())
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_many(self):
+        """Test that get_many returns the stored objects in order"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        first, second = State(), State()
+        storage.new(first)
+        storage.new(second)
+        ids = [second.id, "missing", first.id, second.id]
+        self.assertEqual(storage.get_many(State, ids), [second, first])
+        self.assertEqual(storage.get_many(City, ids), [])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_iter_all(self):
+        """Test that iter_all yields the same objects as all"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        for value in (State, State, City):
+            storage.new(value())
+        objs = storage.iter_all(State)
+        self.assertEqual(list(objs), list(storage.all(State).values()))
+        self.assertEqual(list(storage.iter_all()),
+                         list(storage.all().values()))
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search_places(self):
+        """Test that search_places filters by location and amenities"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State()
+        city, other = City(state_id=state.id), City()
+        wifi, pool = Amenity(), Amenity()
+        here = Place(city_id=city.id, amenity_ids=[wifi.id, pool.id])
+        there = Place(city_id=other.id, amenity_ids=[wifi.id])
+        for obj in (state, city, other, wifi, pool, here, there):
+            storage.new(obj)
+        self.assertCountEqual(storage.search_places(), [here, there])
+        self.assertEqual(storage.search_places([state.id]), [here])
+        self.assertCountEqual(storage.search_places([state.id], [other.id]),
+                              [here, there])
+        self.assertCountEqual(storage.search_places(amenities=[wifi.id]),
+                              [here, there])
+        self.assertEqual(storage.search_places([], [other.id], [pool.id]),
+                         [])
+        self.assertEqual(storage.search_places(amenities=[wifi.id,
+                                                          pool.id]), [here])
+        first, second = sorted([here, there], key=lambda place: place.id)
+        self.assertEqual(storage.search_places(limit=1), [first])
+        self.assertEqual(storage.search_places(after=first.id), [second])
+        self.assertEqual(storage.search_places(after=second.id), [])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_amenity_index(self):
+        """Test that the amenity index follows changes of amenity_ids"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        wifi, pool = Amenity(), Amenity()
+        place = Place()
+        for obj in (wifi, pool, place):
+            storage.new(obj)
+        self.assertEqual(storage.search_places(amenities=[wifi.id]), [])
+        place.amenity_ids = [wifi.id, pool.id]
+        self.assertEqual(storage.search_places(amenities=[wifi.id]), [place])
+        self.assertEqual(place.amenities, [wifi, pool])
+        place.amenity_ids = [pool.id]
+        self.assertEqual(storage.search_places(amenities=[wifi.id]), [])
+        storage.delete(place)
+        self.assertEqual(storage.search_places(amenities=[pool.id]), [])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_amenity_index_invalid_and_deleted(self):
+        """Test that the amenity index ignores amenity_ids that are not a
+        list and the amenities that were deleted"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        wifi = Amenity()
+        place = Place(amenity_ids=[wifi.id])
+        for obj in (wifi, place):
+            storage.new(obj)
+        for amenity_ids in (None, "abc", [None, {}, wifi.id]):
+            place.amenity_ids = amenity_ids
+        self.assertEqual(storage.search_places(amenities=[wifi.id]), [place])
+        place.amenity_ids = None
+        self.assertEqual(storage.search_places(amenities=[wifi.id]), [])
+        place.amenity_ids = [wifi.id]
+        storage.delete(wifi)
+        self.assertEqual(storage.search_places(amenities=[wifi.id]), [])
+        storage.new(wifi)
+        self.assertEqual(storage.search_places(amenities=[wifi.id]), [place])
+        place.amenity_ids = None
+        place.city_id = ["not", "an", "id"]
+        storage.delete(place)
+        self.assertEqual(storage.all(Place), {})
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page(self):
+        """Test that page returns the objects after a cursor in id order"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        states = [State() for i in range(4)]
+        for state in states[:3]:
+            storage.new(state)
+        city = City(state_id=states[0].id)
+        storage.new(city)
+        ordered = sorted(states[:3], key=lambda state: state.id)
+        self.assertEqual(storage.page(State, limit=2), ordered[:2])
+        self.assertEqual(storage.page(State, ordered[0].id), ordered[1:])
+        storage.new(states[3])
+        storage.delete(ordered[1])
+        ordered = sorted([ordered[0], ordered[2], states[3]],
+                         key=lambda state: state.id)
+        self.assertEqual(storage.page(State), ordered)
+        self.assertEqual(storage.page(City, state_id=states[0].id), [city])
+        self.assertEqual(storage.page(City, state_id=states[1].id), [])
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_version(self):
+        """Test that the version of a class changes with its objects"""
+        storage = FileStorage()
+        version = storage.version(State)
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.assertNotEqual(storage.version(State), version)
+        everything, city_version = storage.version(), storage.version(City)
+        state = State()
+        storage.new(state)
+        self.assertNotEqual(storage.version(), everything)
+        self.assertEqual(storage.version(City), city_version)
+        version = storage.version(State)
+        state.name = "Iowa"
+        self.assertNotEqual(storage.version(State), version)
+        version = storage.version(State)
+        storage.delete(state)
+        self.assertNotEqual(storage.version(State), version)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_builds_same_objects(self):
+        """Test that reload gives back the saved attributes unchanged"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__file_path = "reload_test.json"
+        try:
+            user = User(email="a@b.c", password="pwd")
+            storage.new(user)
+            storage.save()
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(FileStorage._FileStorage__serialized, {})
+            loaded = storage.get(User, user.id)
+            self.assertIsNot(loaded, user)
+            self.assertIs(type(loaded), User)
+            self.assertEqual(loaded.password, user.password)
+            self.assertEqual(loaded.created_at, user.created_at)
+            self.assertEqual(loaded.to_dict(), user.to_dict())
+        finally:
+            FileStorage._FileStorage__objects = save
+            FileStorage._FileStorage__file_path = "file.json"
+            if os.path.exists("reload_test.json"):
+                os.remove("reload_test.json")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lazy_reload(self):
+        """Test that lazy reload builds the objects on first access"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__file_path = "lazy_test.json"
+        FileStorage._FileStorage__lazy = True
+        try:
+            state = State(name="California")
+            cities = [City(name=str(i), state_id=state.id) for i in range(2)]
+            for obj in [state] + cities:
+                storage.new(obj)
+            storage.save()
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(FileStorage._FileStorage__objects, {})
+            self.assertEqual(storage.count(), 3)
+            self.assertEqual(storage.count(City), 2)
+            self.assertEqual(storage.get(State, state.id).name, "California")
+            self.assertEqual(len(FileStorage._FileStorage__objects), 1)
+            self.assertIsNone(storage.get(State, "missing"))
+            storage.save()
+            with open("lazy_test.json", "r") as f:
+                self.assertEqual(len(json.load(f)), 3)
+            storage.delete(cities[0])
+            self.assertEqual(storage.count(City), 1)
+            self.assertEqual(storage.related(City, "state_id", state.id)[0].id,
+                             cities[1].id)
+            self.assertEqual(len(storage.all()), 2)
+        finally:
+            FileStorage._FileStorage__objects = save
+            FileStorage._FileStorage__file_path = "file.json"
+            FileStorage._FileStorage__lazy = file_storage.lazy
+            if os.path.exists("lazy_test.json"):
+                os.remove("lazy_test.json")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_iter_records(self):
+        """Test that the JSON file is read back the same by chunks"""
+        records = {"State.1": {"name": 'a "}, "b": {', "ids": [{"x": 1}]},
+                   'Odd "key\\': {"n": -1.5e3, "ok": True, "none": None},
+                   "Float": 1.5, "Exponent": -2.5E-3, "Big": 1e+30,
+                   "Number": 12345}
+        for options in ({}, {"indent": 4}, {"separators": (",", ":")}):
+            text = json.dumps(records, **options)
+            for size in (1, 3, 64):
+                with self.subTest(options=options, size=size):
+                    items = file_storage.iter_records(io.StringIO(text), size)
+                    self.assertEqual(list(items), list(records.items()))
+        self.assertEqual(list(file_storage.iter_records(io.StringIO(" {} "))),
+                         [])
+        for text, value in (("1.5", 1.5), ("-12", -12), ("2e-3", 2e-3),
+                            ("1.5E+2", 150.0), ("true", True)):
+            for size in (1, 2, 64):
+                with self.subTest(text=text, size=size):
+                    f = io.StringIO('{"a": ' + text + ' }')
+                    self.assertEqual(list(file_storage.iter_records(f, size)),
+                                     [("a", value)])
+        for text in ("", "[]", '{"a": 1', '{"a": 1,}', '{"a": 1 "b": 2}',
+                     '{"a": 1.}', '{"a": 1e}', '{"a": 1.5x}'):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    list(file_storage.iter_records(io.StringIO(text), 2))
@@ -0,0 +1,306 @@
+#!/usr/bin/python3
+"""
+Contains the TestSQLiteStorageDocs and TestSQLiteStorage classes
+"""
+
+from datetime import datetime
+import inspect
+import models
+from models.engine import db_storage, sqlite_storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+from os import getenv
+import pep8
+from sqlalchemy import event, text
+import unittest
+from unittest import mock
+SQLiteStorage = sqlite_storage.SQLiteStorage
+sqlite = getenv("HBNB_TYPE_STORAGE") == "sqlite"
+
+
+class TestSQLiteStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SQLiteStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.sqls_f = inspect.getmembers(SQLiteStorage, inspect.isfunction)
+
+    def test_pep8_conformance_sqlite_storage(self):
+        """Test that models/engine/sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_sqlite_storage(self):
+        """Test tests/test_models/test_sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_sqlite_storage_module_docstring(self):
+        """Test for the sqlite_storage.py module docstring"""
+        self.assertIsNot(sqlite_storage.__doc__, None,
+                         "sqlite_storage.py needs a docstring")
+        self.assertTrue(len(sqlite_storage.__doc__) >= 1,
+                        "sqlite_storage.py needs a docstring")
+
+    def test_sqlite_storage_class_docstring(self):
+        """Test for the SQLiteStorage class docstring"""
+        self.assertIsNot(SQLiteStorage.__doc__, None,
+                         "SQLiteStorage class needs a docstring")
+        self.assertTrue(len(SQLiteStorage.__doc__) >= 1,
+                        "SQLiteStorage class needs a docstring")
+
+    def test_sqls_func_docstrings(self):
+        """Test for the presence of docstrings in SQLiteStorage methods"""
+        for func in self.sqls_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    """Test the SQLiteStorage class"""
+    @unittest.skipIf(not sqlite, "not testing sqlite storage")
+    def test_wal(self):
+        """Test that the database uses write-ahead logging"""
+        engine = models.storage._DBStorage__engine
+        with engine.connect() as connection:
+            mode = connection.exec_driver_sql("PRAGMA journal_mode")
+            self.assertEqual(mode.scalar(), "wal")
+
+    @unittest.skipIf(not sqlite, "not testing sqlite storage")
+    def test_foreign_key_index(self):
+        """Test that the foreign key columns are indexed"""
+        engine = models.storage._DBStorage__engine
+        with engine.connect() as connection:
+            rows = connection.exec_driver_sql("PRAGMA index_list(cities)")
+            names = [row[1] for row in rows]
+        self.assertIn("ix_cities_state_id", names)
+
+    @unittest.skipIf(not sqlite, "not testing sqlite storage")
+    def test_new_save_get(self):
+        """Test that saved objects can be read back"""
+        state = State(name="California")
+        models.storage.new(state)
+        models.storage.save()
+        city = City(name="Fresno", state_id=state.id)
+        models.storage.new(city)
+        models.storage.save()
+        self.assertIs(models.storage.get(State, state.id), state)
+        self.assertEqual(models.storage.count(City),
+                         len(models.storage.all(City)))
+        self.assertIn(city, state.cities)
+        models.storage.delete(city)
+        models.storage.delete(state)
+        models.storage.save()
+        self.assertIsNone(models.storage.get(State, state.id))
+
+    @unittest.skipIf(not sqlite, "not testing sqlite storage")
+    def test_counts(self):
+        """Test that count and counts agree with the stored rows"""
+        state = State(name="California")
+        models.storage.new(state)
+        models.storage.save()
+        counts = models.storage.counts()
+        self.assertEqual(counts["State"], len(models.storage.all(State)))
+        self.assertEqual(models.storage.count(State), counts["State"])
+        self.assertEqual(models.storage.count("State"), counts["State"])
+        self.assertEqual(models.storage.count(), sum(counts.values()))
+        models.storage.delete(state)
+        models.storage.save()
+
+    @unittest.skipIf(not sqlite, "not testing sqlite storage")
+    def test_counters(self):
+        """Test that the counters follow commits and get recounted"""
+        before = models.storage.count(State)
+        state = State(name="Ohio")
+        models.storage.new(state)
+        self.assertEqual(models.storage.count(State), before)
+        models.storage.save()
+        self.assertEqual(models.storage.count(State), before + 1)
+        engine = models.storage._DBStorage__engine
+        with engine.begin() as connection:
+            connection.execute(text("DELETE FROM states WHERE id = :id"),
+                               {"id": state.id})
+        self.assertEqual(models.storage.count(State), before + 1)
+        with mock.patch.object(db_storage, "recount_interval", 0):
+            self.assertEqual(models.storage.count(State), before)
+        models.storage.close()
+
+    @unittest.skipIf(not sqlite, "not testing sqlite storage")
+    def test_counters_recount_during_commit(self):
+        """Test that a commit recounted before its changes are applied is
+        not counted twice"""
+        before = models.storage.count(State)
+        factory = models.storage._DBStorage__session.session_factory
+
+        def recount(session):
+            """recounts between the commit and the counters update"""
+            with mock.patch.object(db_storage, "recount_interval", 0):
+                models.storage.counts()
+        event.listen(factory, "after_commit", recount, insert=True)
+        try:
+            state = State(name="Texas")
+            state.save()
+        finally:
+            event.remove(factory, "after_commit", recount)
+        self.assertEqual(models.storage.count(State), before + 1)
+        models.storage.delete(state)
+        models.storage.save()
+        self.assertEqual(models.storage.count(State), before)
+        models.storage.close()
+
+    @unittest.skipIf(not sqlite, "not testing sqlite storage")
+    def test_get_many(self):
+        """Test that get and get_many look objects up by primary key"""
+        first, second = State(name="Nevada"), State(name="Utah")
+        models.storage.new(first)
+        models.storage.new(second)
+        models.storage.save()
+        self.assertIs(models.storage.get(State, first.id), first)
+        self.assertIsNone(models.storage.get(State, first.id[:8] + "%"))
+        ids = [second.id, "missing", first.id]
+        self.assertEqual(models.storage.get_many(State, ids),
+                         [second, first])
+        self.assertEqual(models.storage.get_many(City, ids), [])
+        models.storage.delete(first)
+        models.storage.delete(second)
+        models.storage.save()
+
+    @unittest.skipIf(not sqlite, "not testing sqlite storage")
+    def test_page(self):
+        """Test that page returns the objects after a cursor in id order"""
+        state = State(name="Oregon")
+        cities = [City(name=str(i), state_id=state.id) for i in range(3)]
+        for obj in [state] + cities:
+            models.storage.new(obj)
+        models.storage.save()
+        cities.sort(key=lambda city: city.id)
+        page = models.storage.page(City, limit=2, state_id=state.id)
+        self.assertEqual(page, cities[:2])
+        self.assertEqual(models.storage.page(City, page[-1].id,
+                                             state_id=state.id), cities[2:])
+        self.assertIn(state, models.storage.page(State))
+        for obj in cities + [state]:
+            models.storage.delete(obj)
+        models.storage.save()
+
+    @unittest.skipIf(not sqlite, "not testing sqlite storage")
+    def test_fields(self):
+        """Test that only the columns named in fields are loaded"""
+        state = State(name="Maine")
+        models.storage.new(state)
+        models.storage.save()
+        models.storage.close()
+        states = models.storage.page(State, fields=["name"])
+        loaded = [obj for obj in states if obj.id == state.id][0]
+        self.assertEqual(loaded.to_dict(["name"]), {"name": "Maine"})
+        self.assertNotIn("updated_at", loaded.__dict__)
+        models.storage.close()
+        loaded = next(obj for obj in models.storage.iter_all(
+            State, fields=["id"]) if obj.id == state.id)
+        self.assertNotIn("name", loaded.__dict__)
+        models.storage.delete(loaded)
+        models.storage.save()
+        models.storage.close()
+
+    @unittest.skipIf(not sqlite, "not testing sqlite storage")
+    def test_version(self):
+        """Test that the version of a class changes with its objects"""
+        version, everything = models.storage.version(State), \
+            models.storage.version()
+        city_version = models.storage.version(City)
+        state = State(name="Idaho")
+        state.save()
+        self.assertNotEqual(models.storage.version(State), version)
+        self.assertNotEqual(models.storage.version(), everything)
+        self.assertEqual(models.storage.version(City), city_version)
+        version = models.storage.version(State)
+        state.name = "Iowa"
+        state.save()
+        self.assertNotEqual(models.storage.version(State), version)
+        version = models.storage.version(State)
+        models.storage.delete(state)
+        models.storage.save()
+        self.assertNotEqual(models.storage.version(State), version)
+
+    @unittest.skipIf(not sqlite, "not testing sqlite storage")
+    def test_version_recount(self):
+        """Test that the versions follow the changes made by other
+        processes once the rows are recounted every version_interval"""
+        state = State(name="Maine")
+        state.save()
+        version = models.storage.version(State)
+        engine = models.storage._DBStorage__engine
+        with engine.begin() as connection:
+            connection.execute(text("UPDATE states SET name = 'Vermont', "
+                                    "updated_at = :now WHERE id = :id"),
+                               {"now": datetime.utcnow(), "id": state.id})
+        with mock.patch.object(db_storage, "version_interval", 3600):
+            self.assertEqual(models.storage.version(State), version)
+        with mock.patch.object(db_storage, "recount_interval", 3600), \
+                mock.patch.object(db_storage, "version_interval", 0):
+            self.assertNotEqual(models.storage.version(State), version)
+        models.storage.delete(state)
+        models.storage.save()
+        models.storage.close()
+
+    @unittest.skipIf(not sqlite, "not testing sqlite storage")
+    def test_iter_all(self):
+        """Test that iter_all streams the same objects as all"""
+        states = [State(name=str(i)) for i in range(5)]
+        for state in states:
+            models.storage.new(state)
+        models.storage.save()
+        objs = list(models.storage.iter_all(State, chunk_size=2))
+        self.assertCountEqual(objs, models.storage.all(State).values())
+        for state in states:
+            models.storage.delete(state)
+        models.storage.save()
+
+    @unittest.skipIf(not sqlite, "not testing sqlite storage")
+    def test_search_places(self):
+        """Test that search_places filters by location and amenities"""
+        state, user = State(name="California"), User(email="a", password="b")
+        city = City(name="Fresno", state_id=state.id)
+        other = City(name="Reno", state_id=state.id)
+        wifi, pool = Amenity(name="Wifi"), Amenity(name="Pool")
+        here = Place(name="Here", city_id=city.id, user_id=user.id)
+        there = Place(name="There", city_id=other.id, user_id=user.id)
+        here.amenities.extend([wifi, pool])
+        there.amenities.append(wifi)
+        for obj in (state, user, city, other, wifi, pool, here, there):
+            models.storage.new(obj)
+        models.storage.save()
+
+        def search(*args, **kwargs):
+            """returns the list of the places found by search_places"""
+            return list(models.storage.search_places(*args, **kwargs))
+        self.assertCountEqual(search([state.id]), [here, there])
+        self.assertEqual(search([], [other.id]), [there])
+        self.assertCountEqual(search(amenities=[wifi.id]), [here, there])
+        self.assertEqual(search([state.id], [], [wifi.id, pool.id]), [here])
+        self.assertEqual(search([], [other.id], [pool.id]), [])
+        first, second = sorted([here, there], key=lambda place: place.id)
+        self.assertEqual(models.storage.search_places([state.id], limit=1),
+                         [first])
+        self.assertEqual(search([state.id], after=first.id), [second])
+        ids = [first.id, second.id]
+        objs = [(type(obj), obj.id) for obj in
+                (here, there, city, other, wifi, pool, state, user)]
+        places = models.storage.search_places([state.id], chunk_size=1)
+        self.assertNotIsInstance(places, list)
+        models.storage.close()
+        self.assertEqual([place.id for place in places], ids)
+        models.storage.close()
+        for cls, id in objs:
+            models.storage.delete(models.storage.get(cls, id))
+            models.storage.save()